@@ -1,10 +1,31 @@
+import os
+import time
+
+START = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import joblib
-import matplotlib.pyplot as plt
-import time
-from matplotlib.ticker import FuncFormatter
+
+from utils.backtest import SUMMARY_PATH as BACKTEST_SUMMARY_PATH
+from utils.backtest import load_summary as load_backtest_summary
+from utils.charts import figure_png, projection_figure, risk_heatmap, sweep_figure, validation_chart_spec
+from utils.config import CONFIG, HORIZONS, REGIONS
+from utils.demand_stats import load_demand_stats, stats_path
+from utils.feature_cache import cache_key as validation_cache_key
+from utils.feature_cache import file_digest, load_validation_arrays
+from utils.forecast_grid import build_feature_block, grid_table, input_problem, predict_grid
+from utils.metrics import PROFILE_DIR, SamplingProfiler, record_phases, start_exporters, timed_predict, track_cache
+from utils.model_registry import ModelRegistry
+from utils.preprocess import live_time_features
+from utils.risk import classify_risk, percentile_bands
+from utils.scenario_sweep import DEMAND_BUCKET_MW, MAX_DAYS, TEMPERATURES, demand_bucket, sweep_days, sweep_surface
+from utils.store import load_merged_tail
+from utils.timing import PhaseTimer
+
+# heavy modules (matplotlib, altair, joblib/sklearn) are imported lazily by
+# the page that needs them, so this is all a rerun has to pay for up front
+TIMER = PhaseTimer(start=START)
+TIMER.mark("imports")
 
 # -------------------------------------------------
 # Page configuration
@@ -15,272 +36,459 @@ st.set_page_config(
 )
 
 # -------------------------------------------------
-# Header
+# Metrics exporters (GRIDGUARD_METRICS_PORT / _FILE) and per-rerun profiling
+# (GRIDGUARD_PROFILE=1 or ?profile=1, folded stacks under profiles/)
 # -------------------------------------------------
-col1, col2 = st.columns([1, 4])
-with col1:
-    st.image("assets/logo.png", width=120)
-with col2:
-    st.title("GridGuard")
-    st.caption("Electricity Demand Forecasting System for Grid Sustainability and Resilience")
+@st.cache_resource
+def start_metrics():
+    start_exporters()
 
-st.divider()
+start_metrics()
 
-# -------------------------------------------------
-# Sidebar introduction
-# -------------------------------------------------
-st.sidebar.markdown("## About GridGuard")
-st.sidebar.markdown(
-    """
-GridGuard helps estimate short term electricity demand so grid operators
-can see stress coming before it becomes a problem.
+PROFILER = None
+if os.environ.get("GRIDGUARD_PROFILE") == "1" or st.query_params.get("profile") == "1":
+    PROFILER = SamplingProfiler().start()
 
-It’s designed to support:
-- Early blackout prevention
-- Smarter use of renewables and storage
-- Less reliance on emergency fossil fuel generators
+# everything below runs inside try, so a page that raises still stops the
+# profiler instead of leaving it sampling across later reruns
+try:
+    # -------------------------------------------------
+    # Header
+    # -------------------------------------------------
+    @st.cache_resource
+    def load_logo():
+        with open("assets/logo.png", "rb") as f:
+            return f.read()
 
-The goal is simple: make the grid more reliable, cleaner, and easier to plan for.
-"""
-)
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        st.image(load_logo(), width=120)
+    with col2:
+        st.title("GridGuard")
+        st.caption("Electricity Demand Forecasting System for Grid Sustainability and Resilience")
 
-# -------------------------------------------------
-# GitHub link
-# -------------------------------------------------
-st.sidebar.markdown(
-    "[View the project on GitHub](https://github.com/chaitanya-melnatami/GridGuard-App)"
-)
-st.sidebar.divider()
+    st.divider()
+    TIMER.mark("first paint")
 
-# -------------------------------------------------
-# Sidebar controls
-# -------------------------------------------------
-page = st.sidebar.radio("Navigation", ["Live Forecast", "Model Validation"])
-region = st.sidebar.selectbox("Region", ["Austin", "Dallas", "Houston"])
-horizon = st.sidebar.selectbox(
-    "Forecast Horizon",
-    [1, 3, 6, 24],
-    format_func=lambda x: f"{x}-Hour Ahead"
-)
-days_to_show = st.sidebar.slider("Days to Display (Validation)", 1, 30, 7)
+    # -------------------------------------------------
+    # Sidebar introduction
+    # -------------------------------------------------
+    st.sidebar.markdown("## About GridGuard")
+    st.sidebar.markdown(
+        """
+    GridGuard helps estimate short term electricity demand so grid operators
+    can see stress coming before it becomes a problem.
+
+    It’s designed to support:
+    - Early blackout prevention
+    - Smarter use of renewables and storage
+    - Less reliance on emergency fossil fuel generators
+
+    The goal is simple: make the grid more reliable, cleaner, and easier to plan for.
+    """
+    )
 
-# -------------------------------------------------
-# Region configuration
-# -------------------------------------------------
-CONFIG = {
-    "Austin": {
-        "data": "data/merged/austin_scent_merged.csv",
-        "temp_col": "austin_temp_c",
-        "model": "models/austin_model"
-    },
-    "Dallas": {
-        "data": "data/merged/dallas_ncent_merged.csv",
-        "temp_col": "temp_c",
-        "model": "models/dallas_model"
-    },
-    "Houston": {
-        "data": "data/merged/houston_coast_merged.csv",
-        "temp_col": "temp_c",
-        "model": "models/houston_model"
-    }
-}
-cfg = CONFIG[region]
+    # -------------------------------------------------
+    # GitHub link
+    # -------------------------------------------------
+    st.sidebar.markdown(
+        "[View the project on GitHub](https://github.com/chaitanya-melnatami/GridGuard-App)"
+    )
+    st.sidebar.divider()
 
-# -------------------------------------------------
-# Month mapping
-# -------------------------------------------------
-MONTHS = {
-    "January": 1, "February": 2, "March": 3, "April": 4,
-    "May": 5, "June": 6, "July": 7, "August": 8,
-    "September": 9, "October": 10, "November": 11, "December": 12
-}
+    # -------------------------------------------------
+    # Sidebar controls
+    # -------------------------------------------------
+    PAGES = ["Live Forecast", "Forecast Grid", "Scenario Sweep", "Model Validation", "Backtest"]
+    page = st.sidebar.radio("Navigation", PAGES, key="page")
+    region = st.sidebar.selectbox("Region", REGIONS)
+    horizon = st.sidebar.selectbox(
+        "Forecast Horizon",
+        HORIZONS,
+        format_func=lambda x: f"{x}-Hour Ahead"
+    )
+    days_to_show = st.sidebar.slider("Days to Display (Validation)", 1, 365, 7)
 
-# -------------------------------------------------
-# Load historical demand percentiles (city-specific)
-# -------------------------------------------------
-@st.cache_data
-def load_percentiles(path):
-    df = pd.read_csv(path)
-    return {
-        "p10": np.percentile(df["demand_mw"], 10),
-        "p25": np.percentile(df["demand_mw"], 25),
-        "p75": np.percentile(df["demand_mw"], 75),
-        "p90": np.percentile(df["demand_mw"], 90)
-    }
+    # -------------------------------------------------
+    # Region configuration
+    # -------------------------------------------------
+    cfg = CONFIG[region]
 
-PCTS = load_percentiles(cfg["data"])
+    # -------------------------------------------------
+    # Shared model registry (one per process, shared by all sessions)
+    # -------------------------------------------------
+    @st.cache_resource
+    def get_registry():
+        return ModelRegistry()
 
-# -------------------------------------------------
-# Live forecast page
-# -------------------------------------------------
-if page == "Live Forecast":
-    st.subheader("Live Demand Forecast")
-
-    colA, colB = st.columns(2)
-
-    with colA:
-        demand = st.number_input(
-            "Current Demand (MW)",
-            min_value=1000.0,
-            max_value=120000.0,
-            value=15000.0,
-            step=500.0
+    REGISTRY = get_registry()
+
+    # -------------------------------------------------
+    # Cached validation features and predictions
+    # -------------------------------------------------
+    @track_cache("validation_arrays_resource", st.cache_resource(max_entries=24))
+    def load_validation(region, horizon, key):
+        return load_validation_arrays(
+            region, horizon, lambda: REGISTRY.get(region, horizon), key=key
         )
-        temp = st.number_input(
-            "Temperature (°C)",
-            min_value=-20.0,
-            max_value=60.0,
-            value=25.0
+
+    # -------------------------------------------------
+    # Validation chart specs, one per (region, horizon, window)
+    # -------------------------------------------------
+    @track_cache("validation_spec", st.cache_data(max_entries=64))
+    def load_validation_spec(region, horizon, days, key):
+        arrays = load_validation(region, horizon, key)
+
+        # the slider only slices the cached test split
+        window = slice(max(int(arrays["split"]), len(arrays["target"]) - days * 24), None)
+        return validation_chart_spec(
+            arrays["timestamp"][window], arrays["target"][window], arrays["pred"][window]
         )
 
-    with colB:
-        month_name = st.selectbox("Month", list(MONTHS.keys()))
-        day = st.selectbox("Day", list(range(1, 32)))
-        hour = st.slider("Hour of Day", 0, 23, 14)
+    # -------------------------------------------------
+    # Latest observed demand and temperature per region
+    # -------------------------------------------------
+    @track_cache("latest_conditions", st.cache_data(ttl=3600))
+    def load_latest_conditions():
+        latest = {}
+        for r in REGIONS:
+            last = load_merged_tail(r).iloc[-1]
+            latest[r] = (float(last["demand_mw"]), float(last[CONFIG[r]["temp_col"]]))
+        return latest
 
-    month = MONTHS[month_name]
+    # -------------------------------------------------
+    # Month mapping
+    # -------------------------------------------------
+    MONTHS = {
+        "January": 1, "February": 2, "March": 3, "April": 4,
+        "May": 5, "June": 6, "July": 7, "August": 8,
+        "September": 9, "October": 10, "November": 11, "December": 12
+    }
 
     # -------------------------------------------------
-    # Feature engineering
+    # Historical demand percentiles (city-specific, from the stats sidecar)
     # -------------------------------------------------
-    day_of_year = int((month - 1) * 30.4 + day)
+    @track_cache("percentiles", st.cache_data)
+    def load_percentiles(region, mtime):
+        # mtime is only part of the cache key, so a rebuilt sidecar is picked up
+        return percentile_bands(load_demand_stats(region))
 
-    sin_hour = np.sin(2 * np.pi * hour / 24)
-    cos_hour = np.cos(2 * np.pi * hour / 24)
-    sin_doy = np.sin(2 * np.pi * day_of_year / 365)
-    cos_doy = np.cos(2 * np.pi * day_of_year / 365)
+    def stats_mtime(region):
+        path = stats_path(region)
+        return os.path.getmtime(path) if os.path.exists(path) else None
 
-    X_live = pd.DataFrame([{
-        "demand_mw": demand,
-        cfg["temp_col"]: temp,
-        "sin_hour": sin_hour,
-        "cos_hour": cos_hour,
-        "dayofweek": 0,
-        "is_weekend": 0,
-        "sin_doy": sin_doy,
-        "cos_doy": cos_doy
-    }])
+    # -------------------------------------------------
+    # Scenario sweep surfaces, one per (region, horizon, demand bucket, days)
+    # -------------------------------------------------
+    @track_cache("scenario_sweep", st.cache_data(max_entries=64))
+    def load_sweep(region, horizon, bucket, days, model_hash):
+        # model_hash is only part of the cache key, so a retrained model is picked up
+        return sweep_surface(REGISTRY.get(region, horizon), region, bucket, days)
+
+    # the rendered heatmap is cached too, drawing it costs far more than the predict
+    @track_cache("scenario_sweep_chart", st.cache_data(max_entries=64))
+    def load_sweep_chart(region, horizon, bucket, days, model_hash, stats_mtime):
+        surface = load_sweep(region, horizon, bucket, days, model_hash)
+        pcts = load_percentiles(region, stats_mtime)
+        return figure_png(sweep_figure(surface, days, TEMPERATURES, pcts))
 
     # -------------------------------------------------
-    # Load model and predict
+    # Backtest metrics (written by python -m utils.backtest)
     # -------------------------------------------------
-    with st.spinner("Running forecast model…"):
-        time.sleep(0.4)
-        model = joblib.load(f"{cfg['model']}_{horizon}h.pkl")
-        prediction = model.predict(X_live)[0]
+    @track_cache("backtest", st.cache_data)
+    def load_backtest(region, horizon, mtime):
+        # mtime is only part of the cache key, so a new backtest run is picked up
+        return load_backtest_summary(region, horizon)
 
-    st.metric(
-        f"{horizon}-Hour Forecasted Demand",
-        f"{prediction:,.0f} MW"
-    )
+    def backtest_mtime():
+        path = BACKTEST_SUMMARY_PATH
+        return os.path.getmtime(path) if os.path.exists(path) else None
 
     # -------------------------------------------------
-    # ✅ FIXED TWO-SIDED RISK ASSESSMENT
+    # Live forecast page
     # -------------------------------------------------
-    delta_pct = ((prediction - demand) / demand) * 100
+    if page == "Live Forecast":
+        st.subheader("Live Demand Forecast")
+
+        colA, colB = st.columns(2)
+
+        with colA:
+            demand = st.number_input(
+                "Current Demand (MW)",
+                min_value=1000.0,
+                max_value=120000.0,
+                value=15000.0,
+                step=500.0
+            )
+            temp = st.number_input(
+                "Temperature (°C)",
+                min_value=-20.0,
+                max_value=60.0,
+                value=25.0
+            )
+
+        with colB:
+            month_name = st.selectbox("Month", list(MONTHS.keys()))
+            day = st.selectbox("Day", list(range(1, 32)))
+            hour = st.slider("Hour of Day", 0, 23, 14)
+
+        month = MONTHS[month_name]
+
+        # -------------------------------------------------
+        # Feature engineering
+        # -------------------------------------------------
+        X_live = pd.DataFrame([{
+            "demand_mw": demand,
+            cfg["temp_col"]: temp,
+            **live_time_features(month, day, hour)
+        }])
+
+        # -------------------------------------------------
+        # Load model and predict
+        # -------------------------------------------------
+        with st.spinner("Running forecast model…"):
+            with TIMER.phase("model load"):
+                model = REGISTRY.get(region, horizon)
+            with TIMER.phase("predict"):
+                prediction = timed_predict(model, X_live, "live_forecast")[0]
+
+        st.metric(
+            f"{horizon}-Hour Forecasted Demand",
+            f"{prediction:,.0f} MW"
+        )
 
-    if prediction < PCTS["p10"]:
-        risk = "🔴 High Risk"
-        reason = "Forecasted demand is far below normal historical levels."
-    elif prediction < PCTS["p25"]:
-        risk = "🟡 Medium Risk"
-        reason = "Demand is unusually low compared to typical patterns."
-    elif prediction < PCTS["p75"]:
-        risk = "🟢 Low Risk"
-        reason = "Forecasted demand is within normal operating range."
-    elif prediction < PCTS["p90"]:
-        risk = "🟡 Medium Risk"
-        reason = "Demand is elevated compared to historical norms."
-    else:
-        risk = "🔴 High Risk"
-        reason = "Forecast approaches historical peak demand levels."
+        # -------------------------------------------------
+        # ✅ FIXED TWO-SIDED RISK ASSESSMENT
+        # -------------------------------------------------
+        delta_pct = ((prediction - demand) / demand) * 100
+
+        with TIMER.phase("data"):
+            pcts = load_percentiles(region, stats_mtime(region))
+        risk, reason = classify_risk(prediction, pcts)
 
-    st.subheader("Grid Stress Risk")
-    st.markdown(f"### {risk}")
-    st.caption(f"Projected demand change: {delta_pct:.1f}%")
-    st.info(f"Why: {reason}")
+        st.subheader("Grid Stress Risk")
+        st.markdown(f"### {risk}")
+        st.caption(f"Projected demand change: {delta_pct:.1f}%")
+        st.info(f"Why: {reason}")
+
+        # -------------------------------------------------
+        # Projection chart
+        # -------------------------------------------------
+        with TIMER.phase("chart"):
+            st.pyplot(projection_figure(demand, prediction, horizon))
 
     # -------------------------------------------------
-    # Projection chart
+    # Forecast grid page (all regions x all horizons)
     # -------------------------------------------------
-    upper = prediction * 1.1
-    lower = prediction * 0.9
+    elif page == "Forecast Grid":
+        st.subheader("Forecast Grid (All Regions × All Horizons)")
+
+        with TIMER.phase("data"):
+            latest = load_latest_conditions()
+        inputs_df = st.data_editor(
+            pd.DataFrame([
+                {
+                    "Region": r,
+                    "Current Demand (MW)": latest[r][0],
+                    "Temperature (°C)": latest[r][1]
+                }
+                for r in REGIONS
+            ]),
+            hide_index=True,
+            disabled=["Region"],
+            column_config={
+                "Current Demand (MW)": st.column_config.NumberColumn(
+                    min_value=1000.0, max_value=120000.0, step=500.0, required=True
+                ),
+                "Temperature (°C)": st.column_config.NumberColumn(
+                    min_value=-20.0, max_value=60.0, required=True
+                ),
+            }
+        )
 
-    fig, ax = plt.subplots()
-    ax.plot(["Now", f"+{horizon}h"], [demand, prediction], marker="o", linewidth=3)
-    ax.fill_between(
-        ["Now", f"+{horizon}h"],
-        [demand, lower],
-        [demand, upper],
-        alpha=0.2,
-        label="Confidence Range"
-    )
-    ax.set_ylabel("Demand (MW)")
-    ax.set_title("Future Demand Projection")
-    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{int(x):,}"))
-    ax.grid(alpha=0.3)
-    ax.legend()
-    st.pyplot(fig)
+        colA, colB, colC = st.columns(3)
+        with colA:
+            month_name = st.selectbox("Month", list(MONTHS.keys()))
+        with colB:
+            day = st.selectbox("Day", list(range(1, 32)))
+        with colC:
+            hour = st.slider("Hour of Day", 0, 23, 14)
+
+        # rows the models can't take (a cleared cell, zero demand) are left out
+        inputs = {}
+        for _, row in inputs_df.iterrows():
+            problem = input_problem(row["Current Demand (MW)"], row["Temperature (°C)"])
+            if problem:
+                st.warning(f"{row['Region']} skipped: {problem}")
+            else:
+                inputs[row["Region"]] = (float(row["Current Demand (MW)"]), float(row["Temperature (°C)"]))
+        regions = [r for r in REGIONS if r in inputs]
+
+        if regions:
+            X_grid = build_feature_block(inputs, MONTHS[month_name], day, hour, regions=regions)
+
+            with st.spinner("Running all forecast models…"):
+                with TIMER.phase("predict"):
+                    grid = predict_grid(REGISTRY, X_grid, regions=regions)
+
+            with TIMER.phase("data"):
+                pcts = {r: load_percentiles(r, stats_mtime(r)) for r in regions}
+            table = grid_table(grid, inputs, pcts, regions=regions)
+
+            with TIMER.phase("chart"):
+                st.altair_chart(risk_heatmap(table, HORIZONS), width="stretch")
+
+            st.dataframe(
+                table.style.format({"forecast_mw": "{:,.0f}", "change_pct": "{:+.1f}%"}),
+                hide_index=True
+            )
 
-# -------------------------------------------------
-# Model validation page
-# -------------------------------------------------
-else:
-    st.subheader("Model Validation (Historical Performance)")
-
-    df = pd.read_csv(cfg["data"], parse_dates=["timestamp"])
-    df = df.sort_values("timestamp")
-
-    df["hour"] = df["timestamp"].dt.hour
-    df["dayofweek"] = df["timestamp"].dt.dayofweek
-    df["is_weekend"] = df["dayofweek"].isin([5, 6]).astype(int)
-    df["dayofyear"] = df["timestamp"].dt.dayofyear
-
-    df["sin_hour"] = np.sin(2 * np.pi * df["hour"] / 24)
-    df["cos_hour"] = np.cos(2 * np.pi * df["hour"] / 24)
-    df["sin_doy"] = np.sin(2 * np.pi * df["dayofyear"] / 365)
-    df["cos_doy"] = np.cos(2 * np.pi * df["dayofyear"] / 365)
-
-    df["target"] = df["demand_mw"].shift(-horizon)
-    df = df.dropna()
-
-    split = int(len(df) * 0.8)
-    test = df.iloc[split:].copy()
-
-    hours_to_show = days_to_show * 24
-    test = test.tail(hours_to_show)
-
-    FEATURES = [
-        "demand_mw",
-        cfg["temp_col"],
-        "sin_hour",
-        "cos_hour",
-        "dayofweek",
-        "is_weekend",
-        "sin_doy",
-        "cos_doy"
-    ]
-
-    model = joblib.load(f"{cfg['model']}_{horizon}h.pkl")
-    pred = model.predict(test[FEATURES])
-
-    fig, ax = plt.subplots(figsize=(12, 5))
-    ax.plot(test["timestamp"], test["target"], label="Actual")
-    ax.plot(test["timestamp"], pred, linestyle="--", label="Predicted")
-    ax.set_ylabel("Demand (MW)")
-    ax.set_xlabel("Time")
-    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{int(x):,}"))
-    ax.legend()
-    ax.grid(alpha=0.3)
-    st.pyplot(fig)
-
-    st.info(
-        "This view compares past model predictions against real demand data. "
-        "It’s meant to show overall accuracy trends. "
-        "Live decisions are based on the Live Forecast page."
-    )
+    # -------------------------------------------------
+    # Scenario sweep page (temperature x hour x day what-ifs)
+    # -------------------------------------------------
+    elif page == "Scenario Sweep":
+        st.subheader("Scenario Sweep (Temperature × Hour of Day)")
+
+        with TIMER.phase("data"):
+            latest = load_latest_conditions()
+
+        colA, colB, colC = st.columns(3)
+        with colA:
+            demand = st.number_input(
+                "Current Demand (MW)",
+                min_value=1000.0,
+                max_value=120000.0,
+                value=float(demand_bucket(latest[region][0])),
+                step=float(DEMAND_BUCKET_MW)
+            )
+        with colB:
+            start = st.date_input("First Day", value=pd.Timestamp.now().date())
+        with colC:
+            n_days = st.slider("Days", 1, MAX_DAYS, 3)
+
+        bucket = demand_bucket(demand)
+        days = sweep_days(start, n_days)
+
+        model_hash = file_digest(REGISTRY.artifact_path(region, horizon))[:12]
+        with st.spinner("Scoring every scenario…"):
+            with TIMER.phase("predict"):
+                surface = load_sweep(region, horizon, bucket, days, model_hash)
+
+        with TIMER.phase("chart"):
+            st.image(load_sweep_chart(region, horizon, bucket, days, model_hash, stats_mtime(region)))
+
+        st.caption(
+            f"{surface.size:,} scenarios ({len(days)} days × 24 hours × {len(TEMPERATURES)} temperatures) "
+            f"from one {horizon}-hour-ahead predict, with current demand held at {bucket:,} MW "
+            f"(rounded to the nearest {DEMAND_BUCKET_MW:,} MW)."
+        )
+        st.info(
+            "Contours mark the historical demand percentiles behind the risk levels: "
+            "below p10 or above p90 is high risk, p10–p25 and p75–p90 medium risk."
+        )
 
-# -------------------------------------------------
-# Footer
-# -------------------------------------------------
-st.caption("GridGuard — Built for sustainability, resilience and awareness")
+    # -------------------------------------------------
+    # Backtest page (every hour of the history as a forecast origin)
+    # -------------------------------------------------
+    elif page == "Backtest":
+        st.subheader("Backtest (Rolling-Origin Accuracy)")
+
+        with TIMER.phase("data"):
+            summary = load_backtest(region, horizon, backtest_mtime())
+
+        if summary.empty:
+            st.warning("No backtest results yet. Run: python -m utils.backtest")
+        else:
+            evaluations = sorted(summary["evaluation"].unique())
+            colA, colB = st.columns(2)
+            with colA:
+                evaluation = st.selectbox(
+                    "Evaluation", evaluations,
+                    index=evaluations.index("saved_holdout") if "saved_holdout" in evaluations else 0
+                )
+            with colB:
+                metric = st.radio("Metric", ["mae", "rmse", "mape"], horizontal=True)
+
+            rows = summary[summary["evaluation"] == evaluation]
+            overall = rows[rows["breakdown"] == "all"].iloc[0]
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Forecasts", f"{int(overall['n']):,}")
+            c2.metric("MAE", f"{overall['mae']:,.0f} MW")
+            c3.metric("RMSE", f"{overall['rmse']:,.0f} MW")
+            c4.metric("MAPE", f"{overall['mape']:.1f}%")
+
+            month_names = {n: name[:3] for name, n in MONTHS.items()}
+            labels = {
+                "month": lambda b: f"{b:02d} {month_names[b]}",
+                "hour": lambda b: f"{b:02d}:00",
+                "decile": lambda b: f"D{b:02d}",
+            }
+            titles = {"month": "By Month", "hour": "By Hour of Day", "decile": "By Demand Decile"}
+            with TIMER.phase("chart"):
+                for breakdown in ["month", "hour", "decile"]:
+                    part = rows[rows["breakdown"] == breakdown]
+                    st.markdown(f"**{titles[breakdown]}**")
+                    st.bar_chart(
+                        pd.Series(part[metric].to_numpy(), index=part["bucket"].map(labels[breakdown]), name=metric)
+                    )
+
+            st.info(
+                "Every hour of the history is used as a forecast origin. "
+                "saved_holdout only counts hours the served model was not trained on; "
+                "walk_forward refits on earlier data before each block of months."
+            )
+
+    # -------------------------------------------------
+    # Model validation page
+    # -------------------------------------------------
+    else:
+        st.subheader("Model Validation (Historical Performance)")
+
+        with TIMER.phase("data"):
+            spec = load_validation_spec(
+                region, horizon, days_to_show,
+                validation_cache_key(region, horizon, REGISTRY.artifact_path(region, horizon))
+            )
+        with TIMER.phase("chart"):
+            st.vega_lite_chart(spec, width="stretch")
+
+        st.info(
+            "This view compares past model predictions against real demand data. "
+            "It’s meant to show overall accuracy trends. "
+            "Live decisions are based on the Live Forecast page."
+        )
+
+    # -------------------------------------------------
+    # Model cache status
+    # -------------------------------------------------
+    with st.sidebar.expander("Model cache"):
+        summary = REGISTRY.summary()
+        st.caption(
+            f"{summary['models']} models resident, "
+            f"{summary['resident_mb']:,.0f} / {summary['budget_mb']:,.0f} MB · "
+            f"{summary['hits']} hits, {summary['misses']} loads, {summary['evictions']} evictions"
+        )
+        stats = REGISTRY.stats()
+        if stats:
+            st.dataframe(pd.DataFrame(stats), hide_index=True)
+
+    # -------------------------------------------------
+    # Footer
+    # -------------------------------------------------
+    st.caption("GridGuard — Built for sustainability, resilience and awareness")
+
+    # -------------------------------------------------
+    # Startup / rerun timing (GRIDGUARD_TIMING=1 or ?timing=1)
+    # -------------------------------------------------
+    TIMER.mark("render")
+    st.session_state["timings"] = TIMER.report()
+    record_phases(page, TIMER.phases, TIMER.total())
+finally:
+    if PROFILER is not None:
+        PROFILER.stop()
+        slug = str(st.session_state.get("page", "app")).lower().replace(" ", "_")
+        PROFILER.write(os.path.join(PROFILE_DIR, f"{slug}_{time.strftime('%Y%m%d-%H%M%S')}.folded"))
+
+if os.environ.get("GRIDGUARD_TIMING") == "1" or st.query_params.get("timing") == "1":
+    with st.sidebar.expander("Run timing", expanded=True):
+        st.dataframe(pd.DataFrame(st.session_state["timings"]), hide_index=True)
@@ -0,0 +1,72 @@
+"""Compare sklearn's predict with the flat-array engine at several batch sizes.
+
+Run from the project root:
+
+    python -m bench.bench_inference --region Austin --horizon 1
+"""
+
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from utils.config import CONFIG, feature_columns, model_path
+from utils.flat_forest import FlatForest
+from utils.preprocess import add_time_features
+from utils.store import load_merged
+
+BATCH_SIZES = [1, 24, 720, 8760]
+
+
+def best_time(fn, repeat):
+    # best of `repeat` runs, the usual way to take noise out of micro-benchmarks
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--region", default="Austin", choices=list(CONFIG))
+    parser.add_argument("--horizon", type=int, default=1)
+    parser.add_argument("--model", help="model file (defaults to the region/horizon pickle)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model or model_path(args.region, args.horizon))
+
+    start = time.perf_counter()
+    engine = FlatForest.from_model(model)
+    compile_s = time.perf_counter() - start
+
+    df = add_time_features(load_merged(args.region))
+    X = df[feature_columns(args.region)]
+    # repeat the history if it is shorter than the largest batch
+    X = pd.concat([X] * int(np.ceil(max(BATCH_SIZES) / len(X))), ignore_index=True)
+
+    print(f"{args.region} {args.horizon}h: {engine.meta['n_trees']} trees, "
+          f"{engine.meta['n_nodes']:,} nodes, compiled in {compile_s * 1000:.0f} ms")
+    print(f"{'rows':>6} {'sklearn ms':>11} {'engine ms':>10} {'speedup':>8} {'max abs diff':>13}")
+
+    for n in BATCH_SIZES:
+        X_n = X.iloc[:n]
+        X_np = X_n.to_numpy("float32")
+
+        expected = model.predict(X_n)
+        got = engine.predict(X_np)
+        diff = float(np.max(np.abs(expected - got)))
+        if not np.allclose(expected, got, rtol=1e-9, atol=1e-6):
+            raise AssertionError(f"engine disagrees with sklearn at {n} rows (max diff {diff})")
+
+        sk = best_time(lambda: model.predict(X_n), args.repeat)
+        fast = best_time(lambda: engine.predict(X_np), args.repeat)
+        print(f"{n:>6} {sk * 1000:>11.2f} {fast * 1000:>10.2f} {sk / fast:>7.1f}x {diff:>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Cold-start and rerun timing for each page of the app.
+
+Run from the project root:
+
+    python -m bench.startup_report --target-ms 3000
+
+Every page is started in a fresh Python process, so the first run pays for
+all imports and cold caches just like a new container would. The report
+splits the time into interpreter/streamlit import, the app's own phases
+(imports, first paint, data, model load, predict, chart, render) and a
+warm rerun. Exits with status 1 if any cold first run is over the target.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+PAGES = ["Live Forecast", "Forecast Grid", "Scenario Sweep", "Model Validation", "Backtest"]
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+import_ms = (time.perf_counter() - t0) * 1000
+
+at = AppTest.from_file("app.py", default_timeout=600)
+at.session_state["page"] = sys.argv[1]
+
+t0 = time.perf_counter()
+at.run()
+first_ms = (time.perf_counter() - t0) * 1000
+first = at.session_state["timings"]
+
+t0 = time.perf_counter()
+at.run()
+rerun_ms = (time.perf_counter() - t0) * 1000
+
+print(json.dumps({
+    "errors": [str(e.value) for e in at.exception],
+    "import_ms": import_ms,
+    "first_ms": first_ms,
+    "first": first,
+    "rerun_ms": rerun_ms,
+    "rerun": at.session_state["timings"],
+}))
+"""
+
+
+def run_page(page):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, page],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=None,
+                        help="fail if a page's cold first run takes longer than this")
+    args = parser.parse_args()
+
+    over = []
+    for page in PAGES:
+        result = run_page(page)
+        if result["errors"]:
+            print(f"❌ {page}: {result['errors']}")
+            over.append(page)
+            continue
+
+        cold = result["import_ms"] + result["first_ms"]
+        print(f"\n{page}")
+        print(f"  streamlit import   {result['import_ms']:>9.1f} ms")
+        for row in result["first"]:
+            print(f"  {row['phase']:<18} {row['ms']:>9.1f} ms")
+        print(f"  cold start         {cold:>9.1f} ms")
+        print(f"  warm rerun         {result['rerun_ms']:>9.1f} ms")
+
+        if args.target_ms is not None and cold > args.target_ms:
+            over.append(page)
+
+    if args.target_ms is not None:
+        if over:
+            print(f"\n❌ over the {args.target_ms:.0f} ms target: {', '.join(over)}")
+            sys.exit(1)
+        print(f"\n✅ every page starts within {args.target_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
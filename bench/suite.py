@@ -0,0 +1,311 @@
+"""Benchmark the data, training-input and serving hot paths and keep a history.
+
+Run from the project root:
+
+    python -m bench.suite run                     # 1x, 10x and 100x data
+    python -m bench.suite run --scales 1 10 --skip pages
+    python -m bench.suite compare                 # last run against the one before
+    python -m bench.suite compare --base 0 --threshold 0.2
+
+Everything runs offline against the bundled data/ files. Scaled runs tile
+that year into a synthetic multi-year history (10x is ten consecutive
+years) and write raw ERCOT and NOAA ISD files from it, so cleaning, merge
+and feature construction are timed on the same shapes as real archives.
+Cleaning runs inside a scratch directory and never touches data/.
+
+Groups: clean (ERCOT zone split, NOAA ISD parse), merge (read, join and
+write the cleaned files), features (calendar features), load (model
+artifacts), predict (batch sizes 1 to 8760) and pages (cold run and rerun
+of every app page, in fresh processes). Each result is the best of
+--repeat runs.
+
+Every run appends one JSON line to bench/history.jsonl. compare matches
+results by name and exits with status 1 when any got slower by more than
+--threshold (a fraction, 0.1 = 10%).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench.bench_inference import best_time
+from bench.startup_report import PAGES, run_page
+from clean.clean_ercot_zones import TIME_FORMAT, ZONES, parse_hour_ending, split_zones
+from utils.config import CONFIG, feature_columns, model_path
+from utils.noaa_isd import hourly_means, hourly_sums
+from utils.preprocess import add_time_features
+
+HISTORY_PATH = "bench/history.jsonl"
+
+GROUPS = ["clean", "merge", "features", "load", "predict", "pages"]
+SCALES = [1, 10, 100]
+BATCH_SIZES = [1, 24, 720, 8760]
+
+REGION = "Austin"
+HORIZON = 1
+ERCOT_RAW = "data/ercot/ercot_demand.csv"
+WEATHER_HOURLY = "data/weather/austin_weather_hourly.csv"
+
+REGRESSION_THRESHOLD = 0.10
+
+
+# -------------------------------------------------
+# Synthetic scale-ups
+# -------------------------------------------------
+def _tile(df, scale):
+    """Repeat a year of hourly rows `scale` times, shifting each copy forward."""
+    span = df["timestamp"].max() - df["timestamp"].min() + pd.Timedelta(hours=1)
+    copies = []
+    for i in range(scale):
+        copy = df.copy()
+        copy["timestamp"] = copy["timestamp"] + i * span
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def write_inputs(directory, scale):
+    """Raw ERCOT and ISD files plus cleaned CSVs for a `scale`-year history."""
+    ercot = pd.read_csv(ERCOT_RAW)
+    ercot.insert(0, "timestamp", parse_hour_ending(ercot.pop("Hour Ending")).to_numpy())
+    ercot = _tile(ercot.dropna(subset=["timestamp"]), scale)
+
+    weather = _tile(pd.read_csv(WEATHER_HOURLY, parse_dates=["timestamp"]).dropna(), scale)
+    temp_col = CONFIG[REGION]["temp_col"]
+
+    paths = {
+        "ercot_raw": os.path.join(directory, "ercot_demand.csv"),
+        "isd_raw": os.path.join(directory, "isd_raw.csv"),
+        "ercot_clean": os.path.join(directory, "ercot_clean.csv"),
+        "weather_clean": os.path.join(directory, "weather_clean.csv"),
+    }
+    raw = ercot.copy()
+    raw.insert(0, "Hour Ending", raw.pop("timestamp").dt.strftime(TIME_FORMAT))
+    raw.to_csv(paths["ercot_raw"], index=False)
+
+    # two ISD readings per hour (:00 and :51), the usual METAR cadence
+    tenths = np.round(weather[temp_col].to_numpy() * 10).astype(int)
+    tmp = [f"{'-' if t < 0 else '+'}{abs(t):04d},5" for t in tenths]
+    isd = pd.concat([
+        pd.DataFrame({"DATE": (weather["timestamp"] + offset).dt.strftime("%Y-%m-%dT%H:%M:%S"), "TMP": tmp})
+        for offset in (pd.Timedelta(0), pd.Timedelta(minutes=51))
+    ]).sort_values("DATE")
+    isd.to_csv(paths["isd_raw"], index=False)
+
+    ercot[["timestamp", CONFIG[REGION]["zone"]]].rename(
+        columns={CONFIG[REGION]["zone"]: "demand_mw"}
+    ).to_csv(paths["ercot_clean"], index=False)
+    weather.to_csv(paths["weather_clean"], index=False)
+    return paths, len(ercot)
+
+
+# -------------------------------------------------
+# Benchmarks, each returns {name: (seconds, rows)}
+# -------------------------------------------------
+def bench_clean(paths, rows, repeat):
+    workdir = os.path.dirname(paths["ercot_raw"])
+
+    def ercot():
+        # split_zones writes under data/ercot relative to the working directory
+        with contextlib.chdir(workdir):
+            split_zones([os.path.abspath(paths["ercot_raw"])], zones=ZONES)
+
+    def noaa():
+        hourly_means(hourly_sums(paths["isd_raw"]))
+
+    return {
+        "clean.ercot": (best_time(ercot, repeat), rows),
+        "clean.noaa": (best_time(noaa, repeat), rows * 2),
+    }
+
+
+def bench_merge(paths, rows, repeat):
+    out = os.path.join(os.path.dirname(paths["ercot_raw"]), "merged.csv")
+
+    def merge():
+        ercot = pd.read_csv(paths["ercot_clean"], parse_dates=["timestamp"])
+        weather = pd.read_csv(paths["weather_clean"], parse_dates=["timestamp"])
+        pd.merge(ercot, weather, on="timestamp", how="inner").to_csv(out, index=False)
+
+    return {"merge": (best_time(merge, repeat), rows)}
+
+
+def bench_features(paths, rows, repeat):
+    ercot = pd.read_csv(paths["ercot_clean"], parse_dates=["timestamp"])
+    weather = pd.read_csv(paths["weather_clean"], parse_dates=["timestamp"])
+    merged = pd.merge(ercot, weather, on="timestamp", how="inner")
+    columns = feature_columns(REGION)
+
+    def features():
+        add_time_features(merged.copy())[columns].to_numpy("float32")
+
+    return {"features": (best_time(features, repeat), len(merged))}
+
+
+def bench_load(repeat):
+    import joblib
+
+    from utils.flat_forest import flat_model_path, load_flat
+
+    results = {}
+    path = model_path(REGION, HORIZON)
+    if os.path.exists(path):
+        # the first load also pays for importing sklearn, which isn't the artifact's cost
+        joblib.load(path)
+        results["load.pickle"] = (best_time(lambda: joblib.load(path), repeat), 1)
+    flat = flat_model_path(REGION, HORIZON)
+    if os.path.exists(os.path.join(flat, "meta.json")):
+        results["load.flat"] = (best_time(lambda: load_flat(flat), repeat), 1)
+    return results
+
+
+def bench_predict(repeat):
+    from utils.model_registry import ModelRegistry
+    from utils.store import load_merged
+
+    model = ModelRegistry().get(REGION, HORIZON)
+    X = add_time_features(load_merged(REGION))[feature_columns(REGION)]
+    X = pd.concat([X] * int(np.ceil(max(BATCH_SIZES) / len(X))), ignore_index=True)
+
+    model.predict(X.iloc[:1])
+    results = {}
+    for n in BATCH_SIZES:
+        X_n = X.iloc[:n]
+        results[f"predict.{n}"] = (best_time(lambda: model.predict(X_n), repeat), n)
+    return results
+
+
+def bench_pages():
+    results = {}
+    for page in PAGES:
+        result = run_page(page)
+        if result["errors"]:
+            raise RuntimeError(f"{page}: {result['errors']}")
+        key = page.lower().replace(" ", "_")
+        results[f"pages.{key}.cold"] = ((result["import_ms"] + result["first_ms"]) / 1000, 1)
+        results[f"pages.{key}.rerun"] = (result["rerun_ms"] / 1000, 1)
+    return results
+
+
+def run(groups, scales, repeat):
+    results = []
+
+    def record(scale, timings):
+        for name, (seconds, rows) in timings.items():
+            results.append({
+                "name": name if scale is None else f"{name}@{scale}x",
+                "seconds": seconds,
+                "rows_per_s": rows / seconds if seconds else None,
+            })
+            print(f"  {results[-1]['name']:<32} {seconds * 1000:>10.1f} ms")
+
+    for scale in scales if {"clean", "merge", "features"} & set(groups) else []:
+        with tempfile.TemporaryDirectory(prefix="gridguard-bench-") as directory:
+            paths, rows = write_inputs(directory, scale)
+            print(f"{scale}x data: {rows:,} hours")
+            if "clean" in groups:
+                record(scale, bench_clean(paths, rows, repeat))
+            if "merge" in groups:
+                record(scale, bench_merge(paths, rows, repeat))
+            if "features" in groups:
+                record(scale, bench_features(paths, rows, repeat))
+
+    if "load" in groups:
+        record(None, bench_load(repeat))
+    if "predict" in groups:
+        record(None, bench_predict(repeat))
+    if "pages" in groups:
+        record(None, bench_pages())
+    return results
+
+
+# -------------------------------------------------
+# History
+# -------------------------------------------------
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def append_history(results, path=HISTORY_PATH):
+    entry = {
+        "run_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def read_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(base, head, threshold):
+    """Table of results in both runs and the list of regressions beyond threshold."""
+    base_s = {r["name"]: r["seconds"] for r in base["results"]}
+    rows = [
+        {"name": r["name"], "base_ms": base_s[r["name"]] * 1000, "head_ms": r["seconds"] * 1000,
+         "change": r["seconds"] / base_s[r["name"]] - 1}
+        for r in head["results"] if base_s.get(r["name"])
+    ]
+    table = pd.DataFrame(rows, columns=["name", "base_ms", "head_ms", "change"])
+    return table, table[table["change"] > threshold]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["run", "compare"])
+    parser.add_argument("--scales", nargs="+", type=int, default=SCALES, help="data sizes in years (run)")
+    parser.add_argument("--skip", nargs="+", default=[], choices=GROUPS, help="groups to leave out (run)")
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many runs (run)")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--base", type=int, default=-2, help="history entry to compare against (compare)")
+    parser.add_argument("--head", type=int, default=-1, help="history entry to check (compare)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="slowdown that counts as a regression (compare)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        groups = [g for g in GROUPS if g not in args.skip]
+        started = time.perf_counter()
+        entry = append_history(run(groups, sorted(args.scales), args.repeat), args.history)
+        print(f"✅ {len(entry['results'])} results in {time.perf_counter() - started:.0f}s appended to {args.history}")
+        return
+
+    history = read_history(args.history)
+    if len(history) < 2:
+        raise SystemExit(f"Need two runs in {args.history} to compare, found {len(history)}")
+    base, head = history[args.base], history[args.head]
+    table, regressions = compare(base, head, args.threshold)
+
+    print(f"base {base['run_at']} ({base['commit']})  vs  head {head['run_at']} ({head['commit']})")
+    print(table.to_string(index=False, formatters={
+        "base_ms": "{:,.1f}".format, "head_ms": "{:,.1f}".format, "change": "{:+.1%}".format,
+    }))
+    if len(regressions):
+        print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions['name'])}")
+        sys.exit(1)
+    print(f"\n✅ no regressions over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Split ERCOT's hourly load file into one cleaned CSV per weather zone.
+
+Run from the project root:
+
+    python -m clean.clean_ercot_zones
+    python -m clean.clean_ercot_zones data/ercot/archive_2019.csv data/ercot/archive_2020.csv
+
+The input is read once, in chunks, and every zone column is written out in
+the same pass, so multi-year archives never have to fit in memory and each
+extra zone costs nothing. Input files are read in the order given and
+should be in time order.
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+ERCOT_DIR = "data/ercot"
+DEFAULT_INPUT = os.path.join(ERCOT_DIR, "ercot_demand.csv")
+
+# the eight weather zones plus the system total
+ZONES = ["COAST", "EAST", "FWEST", "NORTH", "NCENT", "SOUTH", "SCENT", "WEST", "ERCOT"]
+
+# column names used by older ERCOT archive files
+ZONE_ALIASES = {
+    "FAR_WEST": "FWEST",
+    "NORTH_C": "NCENT",
+    "SOUTHERN": "SOUTH",
+    "SOUTH_C": "SCENT",
+}
+
+TIME_FORMAT = "%m/%d/%Y %H:%M"
+CHUNK_ROWS = 100_000
+
+
+def zone_path(zone):
+    return os.path.join(ERCOT_DIR, f"ercot_{zone.lower()}_cleaned.csv")
+
+
+def parse_hour_ending(values):
+    """ERCOT "Hour Ending" strings to timestamps with one explicit format.
+
+    Some files prefix the value with "HE ". The last hour of each day is
+    written as 24:00 and becomes 00:00 of the next day. The repeated hour
+    at the end of daylight saving time is marked " DST"; it is returned as
+    NaT so the first reading of that hour is the one kept.
+    """
+    text = values.astype("string").str.strip().str.removeprefix("HE ")
+    repeated = text.str.endswith("DST")
+    midnight = text.str.endswith(" 24:00")
+    text = text.where(~midnight, text.str[:-5] + "00:00")
+
+    ts = pd.to_datetime(text, format=TIME_FORMAT, errors="coerce")
+    ts = ts.where(~midnight, ts + pd.Timedelta(days=1))
+    return ts.where(~repeated.fillna(False))
+
+
+def split_zones(paths, zones=ZONES, chunk_rows=CHUNK_ROWS):
+    """Stream the input files and write every zone's cleaned CSV.
+
+    Returns the number of rows written per zone.
+    """
+    os.makedirs(ERCOT_DIR, exist_ok=True)
+    tmp_paths = {zone: f"{zone_path(zone)}.tmp" for zone in zones}
+    outputs = {zone: open(path, "w", newline="") for zone, path in tmp_paths.items()}
+    rows = dict.fromkeys(zones, 0)
+    last = None
+
+    try:
+        for f in outputs.values():
+            f.write("timestamp,demand_mw\n")
+
+        for path in paths:
+            for chunk in pd.read_csv(path, chunksize=chunk_rows):
+                chunk = chunk.rename(columns=ZONE_ALIASES)
+                chunk.index = parse_hour_ending(chunk["Hour Ending"])
+
+                # drop unparseable rows and any hour already written, which
+                # also covers overlapping archive files
+                chunk = chunk[chunk.index.notna()]
+                chunk = chunk[~chunk.index.duplicated()]
+                if last is not None:
+                    chunk = chunk[chunk.index > last]
+                if chunk.empty:
+                    continue
+                last = chunk.index.max()
+
+                for zone in zones:
+                    demand = pd.to_numeric(chunk[zone], errors="coerce").dropna()
+                    demand.rename("demand_mw").to_csv(
+                        outputs[zone], header=False, index_label="timestamp"
+                    )
+                    rows[zone] += len(demand)
+    finally:
+        for f in outputs.values():
+            f.close()
+
+    for zone, tmp in tmp_paths.items():
+        os.replace(tmp, zone_path(zone))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", default=[DEFAULT_INPUT], help="ERCOT hourly load CSVs, oldest first")
+    args = parser.parse_args()
+
+    rows = split_zones(args.inputs)
+    for zone, n in rows.items():
+        print(f"✅ ERCOT {zone} cleaned! {n:,} rows saved to {zone_path(zone)}")
+
+
+if __name__ == "__main__":
+    main()
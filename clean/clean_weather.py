@@ -0,0 +1,63 @@
+"""Turn raw NOAA ISD station files into hourly temperature CSVs.
+
+Run from the project root:
+
+    python -m clean.clean_weather                # every station below
+    python -m clean.clean_weather austin dallas  # just these
+    python -m clean.clean_weather --workers 8
+
+Each station can list several raw files (one per year, say). All files of
+all selected stations are parsed in parallel worker processes and combined
+per station.
+"""
+
+import argparse
+import os
+
+from utils.noaa_isd import parse_stations
+
+# station -> raw ISD files, hourly output, temperature column name
+STATIONS = {
+    "austin": {
+        "raw": ["data/weather/72254013904.csv"],
+        "hourly": "data/weather/austin_weather_hourly.csv",
+        "column": "austin_temp_c",
+    },
+    "dallas": {
+        "raw": ["data/weather/dfw_weather_raw.csv"],
+        "hourly": "data/weather/dfw_weather_hourly.csv",
+        "column": "temp_c",
+    },
+    "houston": {
+        "raw": ["data/weather/houston_weather_raw.csv"],
+        "hourly": "data/weather/houston_weather_hourly.csv",
+        "column": "temp_c",
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("stations", nargs="*", help=f"any of {', '.join(STATIONS)} (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    args = parser.parse_args()
+    names = args.stations or list(STATIONS)
+    unknown = [n for n in names if n not in STATIONS]
+    if unknown:
+        raise SystemExit(f"Unknown station(s): {', '.join(unknown)}")
+
+    missing = [p for name in names for p in STATIONS[name]["raw"] if not os.path.exists(p)]
+    if missing:
+        raise SystemExit(f"Missing raw weather file(s): {', '.join(missing)}")
+
+    hourly = parse_stations({name: STATIONS[name]["raw"] for name in names}, max_workers=args.workers)
+
+    for name in names:
+        station = STATIONS[name]
+        df = hourly[name].rename(station["column"]).reset_index()
+        df.to_csv(station["hourly"], index=False)
+        print(f"✅ {name.capitalize()} hourly weather cleaned! {len(df):,} rows saved to {station['hourly']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Append newly arrived hours to the merged datasets without a full rebuild.
+
+Run from the project root:
+
+    python -m merge.ingest --ercot new_load.csv --weather austin=new_72254013904.csv
+
+--ercot takes rows in ERCOT's hourly load format (Hour Ending plus zone
+columns) and --weather raw NOAA ISD readings for a station; either can be
+left out. An hour is merged once it has both demand and at least one
+temperature reading. Hours with only one side wait in data/ingest until the
+other side arrives, and are dropped once they are more than LATE_HOURS
+behind the newest hour, the same result as the inner join of the batch
+merge scripts.
+
+Only the new rows are read and joined. Complete hours are appended to the
+merged CSV (and the columnar store, if built), folded into the demand percentile sidecar and added to any
+cached validation arrays, so the cost follows the new data rather than the
+history. A batch rebuild (python pipeline.py) from updated raw files
+replaces the merged CSVs as before.
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+from clean.clean_ercot_zones import ZONE_ALIASES, parse_hour_ending
+from utils import store
+from utils.config import CONFIG, HORIZONS, REGIONS
+from utils.csv_append import append_rows, last_timestamp
+from utils.demand_stats import update_demand_stats
+from utils.feature_cache import cache_key, extend_validation_arrays
+from utils.model_registry import ModelRegistry
+from utils.noaa_isd import hourly_sums
+
+PENDING_DIR = "data/ingest"
+
+# how long an hour waits for its other half before it is given up on
+LATE_HOURS = 48
+
+
+def pending_path(region):
+    return os.path.join(PENDING_DIR, f"{region.lower()}_pending.csv")
+
+
+def read_ercot(path):
+    """Zone demand columns indexed by hour from an ERCOT hourly load file."""
+    df = pd.read_csv(path).rename(columns=ZONE_ALIASES)
+    df.index = parse_hour_ending(df["Hour Ending"])
+    df = df[df.index.notna()]
+    return df[~df.index.duplicated()].drop(columns="Hour Ending")
+
+
+def read_weather(path):
+    """Per-hour temperature sum and count from raw ISD readings."""
+    sums = hourly_sums(path)
+    sums.index = pd.DatetimeIndex(sums.index.to_numpy("int64").astype("datetime64[h]").astype("datetime64[ns]"))
+    return sums.rename(columns={"sum": "temp_sum", "count": "temp_count"})
+
+
+def _load_pending(region):
+    path = pending_path(region)
+    if not os.path.exists(path):
+        return pd.DataFrame(
+            columns=["demand_mw", "temp_sum", "temp_count"], dtype="float64",
+            index=pd.DatetimeIndex([], name="timestamp")
+        )
+    return pd.read_csv(path, parse_dates=["timestamp"], index_col="timestamp")
+
+
+def _save_pending(region, pending):
+    os.makedirs(PENDING_DIR, exist_ok=True)
+    path = pending_path(region)
+    tmp = f"{path}.tmp"
+    pending.to_csv(tmp, index_label="timestamp")
+    os.replace(tmp, path)
+
+
+def ingest_region(region, demand=None, weather=None, registry=None):
+    """Merge new demand (Series by hour) and weather (sum/count by hour) for one region.
+
+    Returns (appended, waiting, dropped) hour counts.
+    """
+    cfg = CONFIG[region]
+    merged_path = cfg["data"]
+    last = last_timestamp(merged_path)
+
+    parts = [_load_pending(region)]
+    if demand is not None:
+        parts.append(demand.rename("demand_mw").to_frame())
+    if weather is not None:
+        parts.append(weather)
+    rows = pd.concat(parts).groupby(level=0).agg(
+        {"demand_mw": "last", "temp_sum": "sum", "temp_count": "sum"}
+    )
+    if last is not None:
+        # hours at or before the merged tail are already decided
+        rows = rows[rows.index > last]
+
+    if rows.empty:
+        _save_pending(region, rows)
+        return 0, 0, 0
+
+    cutoff = rows.index.max() - pd.Timedelta(hours=LATE_HOURS)
+    has_demand = rows["demand_mw"].notna()
+    ready = has_demand & (rows["temp_count"] > 0)
+
+    # keep the merged file in time order: stop at the first demand hour that
+    # is still waiting for its weather
+    waiting = rows.index[has_demand & ~ready & (rows.index > cutoff)]
+    if len(waiting):
+        ready &= rows.index < waiting.min()
+
+    out = rows[ready]
+    dropped = ~ready & (rows.index <= cutoff)
+    pending = rows[~ready & ~dropped]
+
+    if len(out):
+        new_rows = pd.DataFrame({
+            "timestamp": out.index,
+            "demand_mw": out["demand_mw"].to_numpy(),
+            cfg["temp_col"]: (out["temp_sum"] / out["temp_count"]).to_numpy(),
+        })
+
+        # cache keys of the current data, so their entries can be carried over
+        registry = registry or ModelRegistry()
+        artifacts = {h: registry.artifact_path(region, h) for h in HORIZONS}
+        old_keys = {
+            h: cache_key(region, h, path) for h, path in artifacts.items() if os.path.exists(path)
+        }
+
+        append_rows(merged_path, new_rows)
+        if store.exists(store.merged_dataset(region)):
+            store.append_frame(store.merged_dataset(region), new_rows)
+        update_demand_stats(region, new_rows)
+
+        for h, key in old_keys.items():
+            extend_validation_arrays(
+                region, h, key, lambda h=h: registry.get(region, h), model_file=artifacts[h]
+            )
+
+    _save_pending(region, pending)
+    return len(out), len(pending), int(dropped.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ercot", help="new rows in ERCOT hourly load format")
+    parser.add_argument("--weather", nargs="*", default=[], metavar="STATION=FILE",
+                        help="new raw ISD readings, station is the lowercase region name")
+    parser.add_argument("--regions", nargs="+", default=REGIONS, choices=REGIONS)
+    args = parser.parse_args()
+
+    ercot = read_ercot(args.ercot) if args.ercot else None
+    weather = {}
+    for item in args.weather:
+        station, _, path = item.partition("=")
+        weather[station.lower()] = read_weather(path)
+
+    registry = ModelRegistry()
+    for region in args.regions:
+        demand = None
+        if ercot is not None:
+            demand = pd.to_numeric(ercot[CONFIG[region]["zone"]], errors="coerce").dropna()
+        appended, waiting, dropped = ingest_region(
+            region, demand, weather.get(region.lower()), registry=registry
+        )
+        print(f"✅ {region}: {appended} hours appended, {waiting} waiting, {dropped} dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,7 @@ merged = pd.merge(
 
 # save the final merged dataset
 merged.to_csv(
-    "data/ercot/austin_scent_merged.csv",
+    "data/merged/austin_scent_merged.csv",
     index=False
 )
 
@@ -0,0 +1,322 @@
+"""Rebuild GridGuard's data and models, skipping everything that is up to date.
+
+Run from the project root:
+
+    python pipeline.py              # run every stage that is out of date
+    python pipeline.py --dry-run    # show what would run
+    python pipeline.py stats_austin # one stage plus whatever it depends on
+    python pipeline.py --force      # ignore the recorded fingerprints
+
+Each stage declares its input and output files. A stage's fingerprint is
+the content hash of its inputs, of the script that implements it and every
+project module that script imports, and of its parameters. A stage only runs when that fingerprint changed since its last
+successful run or one of its outputs is missing. Stages whose inputs do not
+depend on each other (the Austin, Dallas and Houston branches) run in
+parallel.
+"""
+
+import argparse
+import ast
+import functools
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from clean.clean_ercot_zones import ZONES, zone_path
+from clean.clean_weather import STATIONS
+from train.train_models import HYPERPARAMS_PATH
+from utils import backtest, store
+from utils.config import CONFIG, HORIZONS, REGIONS, model_path
+
+STATE_PATH = ".pipeline/state.json"
+
+
+def build_stages():
+    stages = {}
+
+    def stage(name, module, inputs, outputs, args=(), params=None, heavy=False):
+        stages[name] = {
+            "module": module,
+            "args": list(args),
+            "inputs": inputs,
+            "outputs": outputs,
+            "params": params or {},
+            # heavy stages already use every core, so they run one at a time
+            "heavy": heavy,
+        }
+
+    # one pass over the ERCOT file writes every zone
+    stage("clean_ercot_zones", "clean.clean_ercot_zones",
+          ["data/ercot/ercot_demand.csv"], [zone_path(z) for z in ZONES])
+    stage("store_ercot", "utils.store",
+          [zone_path(z) for z in ZONES], [store.meta_path(f"ercot/{z.lower()}") for z in ZONES],
+          args=[f"ercot/{z.lower()}={zone_path(z)}" for z in ZONES])
+
+    for name in REGIONS:
+        region = name.lower()
+        ercot_cleaned = zone_path(CONFIG[name]["zone"])
+        merged = CONFIG[name]["data"]
+        hourly_weather = STATIONS[region]["hourly"]
+
+        stage(f"clean_{region}_weather", "clean.clean_weather",
+              STATIONS[region]["raw"], [hourly_weather], args=[region])
+        stage(f"merge_{region}", f"merge.merge_{region}_ercot",
+              [ercot_cleaned, hourly_weather], [merged])
+        # readers load the columnar copy, so everything downstream waits for it
+        merged_store = store.meta_path(store.merged_dataset(name))
+        stage(f"store_{region}", "utils.store",
+              [merged, hourly_weather], [merged_store, store.meta_path(f"weather/{region}")],
+              args=[f"{store.merged_dataset(name)}={merged}", f"weather/{region}={hourly_weather}"])
+        stage(f"stats_{region}", "utils.demand_stats",
+              [merged_store], [f"data/stats/{region}_demand_stats.json"], args=[name])
+
+    # the tuned forest settings (train.tune_hyperparams) are part of each
+    # region's parameters, so retuning one region only retrains that region
+    tuned = {}
+    if os.path.exists(HYPERPARAMS_PATH):
+        with open(HYPERPARAMS_PATH) as f:
+            tuned = json.load(f)
+
+    for name in REGIONS:
+        region = name.lower()
+        merged_store = store.meta_path(store.merged_dataset(name))
+        models = [model_path(name, h) for h in HORIZONS]
+
+        # the driver fits the region's horizons in parallel
+        stage(f"train_{region}", "train.train_models",
+              [merged_store], models, args=["--regions", name],
+              params={"hyperparams": tuned.get(name, {})}, heavy=True)
+
+        # every hour as a forecast origin, for the app's Backtest page; each
+        # region replaces only its own rows of the shared summary
+        stage(f"backtest_{region}", "utils.backtest",
+              [merged_store] + models,
+              [store.meta_path(backtest.dataset("saved", name, h)) for h in HORIZONS] + [backtest.SUMMARY_PATH],
+              args=["--regions", name], heavy=True)
+
+    # every stage also depends on its upstream stages through their outputs
+    producers = {out: name for name, st in stages.items() for out in st["outputs"]}
+    for st in stages.values():
+        st["deps"] = sorted({producers[i] for i in st["inputs"] if i in producers})
+    return stages
+
+
+def module_path(module):
+    return module.replace(".", os.sep) + ".py"
+
+
+def project_module(name):
+    # the file of a module in this tree, None for the standard library and
+    # installed packages
+    for path in (module_path(name), os.path.join(name.replace(".", os.sep), "__init__.py")):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@functools.cache
+def code_files(module):
+    """The module's file plus every project file it imports, directly or not.
+
+    Imports inside functions count too (utils.backtest loads the models
+    through utils.model_registry), so a change to any of them reruns the stage.
+    """
+    files, todo = set(), [module]
+    while todo:
+        path = project_module(todo.pop())
+        if path is None or path in files:
+            continue
+        files.add(path)
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                todo.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                todo.append(node.module)
+                # "from utils import store" imports a module, not a name
+                todo.extend(f"{node.module}.{alias.name}" for alias in node.names)
+    return sorted(files)
+
+
+class Fingerprints:
+    """sha256 of files, memoized on (size, mtime) across pipeline runs."""
+
+    def __init__(self, memo):
+        self.memo = memo
+        self.lock = threading.Lock()
+
+    def file(self, path):
+        st = os.stat(path)
+        stamp = [st.st_size, st.st_mtime_ns]
+        with self.lock:
+            cached = self.memo.get(path)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        with self.lock:
+            self.memo[path] = stamp + [digest]
+        return digest
+
+    def stage(self, st):
+        h = hashlib.sha256()
+        for path in st["inputs"] + code_files(st["module"]):
+            h.update(path.encode())
+            h.update(self.file(path).encode())
+        h.update(json.dumps([st["args"], st["params"]], sort_keys=True).encode())
+        return h.hexdigest()
+
+
+def load_state():
+    if os.path.exists(STATE_PATH):
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    return {"files": {}, "stages": {}}
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    tmp = f"{STATE_PATH}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+
+def select(stages, targets):
+    # the requested stages plus everything upstream of them
+    if not targets:
+        return set(stages)
+    unknown = [t for t in targets if t not in stages]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)}")
+    wanted, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(stages[name]["deps"])
+    return wanted
+
+
+def run_stage(name, st, heavy_lock):
+    cmd = [sys.executable, "-m", st["module"], *st["args"]]
+    lock = heavy_lock if st["heavy"] else None
+    if lock:
+        lock.acquire()
+    try:
+        start = time.perf_counter()
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return result, time.perf_counter() - start
+    finally:
+        if lock:
+            lock.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", help="stages to bring up to date (default: all)")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--force", action="store_true", help="rerun stages even if up to date")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    stages = build_stages()
+    wanted = select(stages, args.targets)
+    state = load_state()
+    prints = Fingerprints(state["files"])
+    heavy_lock = threading.Lock()
+
+    done, failed, pending = set(), set(), set(wanted)
+    would_run = set()
+    running = {}
+    started = time.perf_counter()
+
+    def decide(name):
+        st = stages[name]
+        if any(d in would_run for d in st["deps"]):
+            return "run", None, "upstream stage would run"
+        missing = [p for p in st["inputs"] if not os.path.exists(p)]
+        if missing:
+            if all(os.path.exists(p) for p in st["outputs"]):
+                return "keep", None, f"input {missing[0]} not present, keeping existing outputs"
+            return "fail", None, f"missing input {missing[0]}"
+        fingerprint = prints.stage(st)
+        outputs_ok = all(os.path.exists(p) for p in st["outputs"])
+        if not args.force and outputs_ok and state["stages"].get(name) == fingerprint:
+            return "skip", fingerprint, "up to date"
+        return "run", fingerprint, "inputs changed" if outputs_ok else "outputs missing"
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        while pending or running:
+            # a failure skips everything downstream of it, not just its
+            # direct dependents, before deciding what can start
+            blocked = [n for n in sorted(pending) if any(d in failed for d in stages[n]["deps"])]
+            while blocked:
+                for name in blocked:
+                    pending.discard(name)
+                    failed.add(name)
+                    print(f"⏭️  {name}: skipped, an upstream stage failed")
+                blocked = [n for n in sorted(pending) if any(d in failed for d in stages[n]["deps"])]
+            ready = [
+                n for n in sorted(pending)
+                if all(d in done or d not in wanted for d in stages[n]["deps"])
+            ]
+
+            for name in ready:
+                pending.discard(name)
+                action, fingerprint, why = decide(name)
+                if action in ("skip", "keep"):
+                    print(f"✔️  {name}: {why}")
+                    done.add(name)
+                elif action == "fail":
+                    print(f"❌ {name}: {why}")
+                    failed.add(name)
+                elif args.dry_run:
+                    print(f"▶️  {name}: would run ({why})")
+                    would_run.add(name)
+                    done.add(name)
+                else:
+                    print(f"▶️  {name}: running ({why})")
+                    future = pool.submit(run_stage, name, stages[name], heavy_lock)
+                    running[future] = (name, fingerprint)
+
+            if not running:
+                if pending and not ready:
+                    # nothing left can start, say so instead of dropping them
+                    for name in sorted(pending):
+                        print(f"⏭️  {name}: skipped, its upstream stages did not finish")
+                    failed.update(pending)
+                    break
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, fingerprint = running.pop(future)
+                result, seconds = future.result()
+                if result.returncode == 0:
+                    done.add(name)
+                    state["stages"][name] = fingerprint
+                    save_state(state)
+                    print(f"✅ {name}: done in {seconds:.1f}s")
+                else:
+                    failed.add(name)
+                    print(f"❌ {name}: failed after {seconds:.1f}s\n{result.stderr.strip()}")
+
+    save_state(state)
+    print(f"Pipeline finished in {time.perf_counter() - started:.1f}s "
+          f"({len(done)} ok, {len(failed)} failed)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
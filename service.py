@@ -0,0 +1,311 @@
+"""Headless GridGuard forecasting service (JSON over HTTP, standard library only).
+
+Run from the project root:
+
+    python service.py --port 8502 --warm
+
+POST /forecast   {"region": "Austin", "horizon": 3, "demand_mw": 15000,
+                  "temp_c": 25, "month": 7, "day": 14, "hour": 14}
+                 or a list of such objects; "year" is optional and
+                 defaults to the current one
+POST /observe    {"region": "Austin", "timestamp": "2024-07-14 14:00",
+                  "demand_mw": 15000, "temp_c": 25} (or a list, in time
+                 order): adds the hour to the region's lag buffers and
+                 returns every horizon from the lag models
+                 (python -m train.train_models --lags)
+GET  /metrics    latency percentiles per endpoint and batching stats
+GET  /metrics/prometheus   the process's counters and histograms as Prometheus text
+GET  /health
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from utils.batching import MicroBatcher
+from utils.config import HORIZONS, REGIONS, feature_columns
+from utils.demand_stats import load_demand_stats, stats_path
+from utils.forecast_grid import input_problem
+from utils.metrics import REGISTRY as METRICS
+from utils.metrics import timed_predict
+from utils.model_registry import DEFAULT_BUDGET_MB, ModelRegistry
+from utils.preprocess import live_time_features
+from utils.quantile_sketch import QuantileSketch
+from utils.risk import classify_risk, percentile_bands
+from utils.streaming import StreamingForecaster
+
+LATENCY_PERCENTILES = [0.5, 0.9, 0.99]
+
+# longest a request waits for its batch before giving up with a 504
+RESULT_TIMEOUT_S = 30.0
+
+
+class RequestError(Exception):
+    """A request the service can't serve as sent, answered with a 400."""
+
+
+@contextmanager
+def _parsing(req):
+    # a missing field or a value of the wrong type is the client's mistake;
+    # the same exceptions from a model further on are the service's
+    try:
+        yield
+    except KeyError as exc:
+        raise RequestError(f"Missing field: {exc.args[0]}") from exc
+    except (TypeError, ValueError) as exc:
+        raise RequestError(f"Invalid request {req!r}: {exc}") from exc
+
+
+def _inputs(req):
+    """(demand_mw, temp_c) of a request, RequestError unless both are usable."""
+    with _parsing(req):
+        problem = input_problem(req["demand_mw"], req["temp_c"])
+    if problem:
+        raise RequestError(problem)
+    return float(req["demand_mw"]), float(req["temp_c"])
+
+
+def _region(req):
+    with _parsing(req):
+        region = req["region"]
+    if region not in REGIONS:
+        raise RequestError(f"Unknown region: {region}")
+    return region
+
+
+class ForecastService:
+    def __init__(self, max_batch=256, max_wait_ms=5.0, budget_mb=None):
+        if budget_mb is None:
+            budget_mb = float(os.environ.get("GRIDGUARD_MODEL_BUDGET_MB", DEFAULT_BUDGET_MB))
+        # the per-horizon and lag models split one RAM budget between them
+        self.registry = ModelRegistry(budget_mb=budget_mb / 2)
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._percentiles = {}
+        self._batchers = {}
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._latency_lock = threading.Lock()
+        self.stream = StreamingForecaster(ModelRegistry(budget_mb=budget_mb / 2, lags=True))
+        self._primed = set()
+
+    def percentiles(self, region):
+        """The region's risk bands, reread whenever its stats sidecar changes."""
+        path = stats_path(region)
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        cached = self._percentiles.get(region)
+        if cached is None or cached[0] != mtime:
+            bands = percentile_bands(load_demand_stats(region))
+            # a missing sidecar is built by load_demand_stats, key on the new file
+            mtime = os.path.getmtime(path) if os.path.exists(path) else None
+            cached = self._percentiles[region] = (mtime, bands)
+        return cached[1]
+
+    def warm(self):
+        for region in REGIONS:
+            for horizon in HORIZONS:
+                self.registry.get(region, horizon)
+
+    def _batcher(self, region, horizon):
+        key = (region, horizon)
+        with self._lock:
+            batcher = self._batchers.get(key)
+            if batcher is None:
+                columns = feature_columns(region)
+
+                def predict(X):
+                    model = self.registry.get(region, horizon)
+                    return timed_predict(model, pd.DataFrame(X, columns=columns), "service")
+
+                batcher = MicroBatcher(
+                    predict,
+                    max_batch=self.max_batch,
+                    max_wait_ms=self.max_wait_ms,
+                    name=f"batcher-{region}-{horizon}h",
+                )
+                self._batchers[key] = batcher
+        return batcher
+
+    def submit(self, req):
+        region = _region(req)
+        with _parsing(req):
+            horizon = int(req["horizon"])
+        if horizon not in HORIZONS:
+            raise RequestError(f"Unsupported horizon: {horizon}")
+
+        demand, temp = _inputs(req)
+        with _parsing(req):
+            year = int(req["year"]) if req.get("year") else None
+            time_feats = live_time_features(int(req["month"]), int(req["day"]), int(req["hour"]), year)
+        row = [demand, temp] + [time_feats[c] for c in feature_columns(region)[2:]]
+        return region, horizon, demand, self._batcher(region, horizon).submit(row)
+
+    def forecast(self, requests):
+        # submit everything first so rows from one call share a batch
+        pending = [self.submit(req) for req in requests]
+
+        results = []
+        for region, horizon, demand, future in pending:
+            prediction = future.result(timeout=RESULT_TIMEOUT_S)
+            risk, reason = classify_risk(prediction, self.percentiles(region))
+            results.append({
+                "region": region,
+                "horizon": horizon,
+                "forecast_mw": prediction,
+                "change_pct": (prediction - demand) / demand * 100,
+                "risk": risk,
+                "reason": reason,
+            })
+        return results
+
+    def observe(self, observations):
+        results = []
+        for obs in observations:
+            region = _region(obs)
+            with _parsing(obs):
+                timestamp = pd.Timestamp(obs["timestamp"])
+            if pd.isna(timestamp):
+                raise RequestError(f"Invalid timestamp: {obs['timestamp']!r}")
+            if region not in self._primed:
+                # first observation of a region, fill its buffers from the stored history
+                self.stream.prime(region)
+                self._primed.add(region)
+
+            demand, temp = _inputs(obs)
+            forecasts = self.stream.observe(region, timestamp, demand, temp)
+            if forecasts is None:
+                results.append({"region": region, "timestamp": obs["timestamp"], "error": "hour already seen"})
+                continue
+            rows = []
+            for horizon, prediction in forecasts.items():
+                row = {"horizon": horizon, "forecast_mw": prediction}
+                if prediction is not None:
+                    row["change_pct"] = (prediction - demand) / demand * 100
+                    row["risk"], row["reason"] = classify_risk(prediction, self.percentiles(region))
+                rows.append(row)
+            results.append({"region": region, "timestamp": obs["timestamp"], "forecasts": rows})
+        return results
+
+    def record_latency(self, endpoint, seconds):
+        with self._latency_lock:
+            self._latency.setdefault(endpoint, QuantileSketch()).add([seconds * 1000])
+
+    def metrics(self):
+        with self._latency_lock:
+            latency = {
+                endpoint: {
+                    "count": sketch.count,
+                    **{
+                        f"p{int(q * 100)}_ms": round(v, 3)
+                        for q, v in zip(LATENCY_PERCENTILES, sketch.quantiles(LATENCY_PERCENTILES))
+                    },
+                }
+                for endpoint, sketch in self._latency.items()
+            }
+        with self._lock:
+            batching = {
+                f"{region}/{horizon}h": {
+                    "batches": b.batches,
+                    "rows": b.rows,
+                    "median_batch": b.batch_sizes.quantile(0.5),
+                    "max_batch": b.batch_sizes.max if b.batches else 0,
+                }
+                for (region, horizon), b in self._batchers.items()
+            }
+        return {
+            "latency": latency,
+            "batching": batching,
+            "models": self.registry.summary(),
+        }
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body, content_type="application/json"):
+            payload = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _timed(self, endpoint, fn):
+            start = time.perf_counter()
+            try:
+                status, body = fn()
+            except RequestError as exc:
+                status, body = 400, {"error": str(exc)}
+            except TimeoutError:
+                status, body = 504, {"error": f"No result within {RESULT_TIMEOUT_S:g}s"}
+            except Exception as exc:
+                # a broken model artifact or similar, still answer with JSON
+                status, body = 500, {"error": f"{type(exc).__name__}: {exc}"}
+            self._send(status, body)
+            service.record_latency(endpoint, time.perf_counter() - start)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._timed("/health", lambda: (200, {"status": "ok"}))
+            elif self.path == "/metrics":
+                self._timed("/metrics", lambda: (200, service.metrics()))
+            elif self.path == "/metrics/prometheus":
+                self._send(200, METRICS.render(), "text/plain; version=0.0.4")
+            else:
+                self._send(404, {"error": f"Unknown path: {self.path}"})
+
+        def do_POST(self):
+            endpoints = {"/forecast": service.forecast, "/observe": service.observe}
+            run = endpoints.get(self.path)
+            if run is None:
+                self._send(404, {"error": f"Unknown path: {self.path}"})
+                return
+
+            def handle():
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"null")
+                except ValueError as exc:
+                    raise RequestError(f"Body is not JSON: {exc}") from exc
+                try:
+                    if isinstance(body, list):
+                        return 200, run(body)
+                    return 200, run([body])[0]
+                except FileNotFoundError as exc:
+                    return 503, {"error": f"Model not trained: {exc.filename}"}
+
+            self._timed(self.path, handle)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GridGuard forecasting service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--warm", action="store_true", help="load every model before serving")
+    args = parser.parse_args()
+
+    service = ForecastService(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    if args.warm:
+        service.warm()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"✅ GridGuard service listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Shrink the trained forests and report what each smaller variant costs.
+
+Run from the project root after the training scripts:
+
+    python -m train.compact_models
+    python -m train.compact_models --export 100:14:float32
+
+Every variant keeps the first N trees (forest trees are exchangeable, so
+any N of them are an unbiased subsample), cuts each tree at a maximum depth
+(the cut node keeps its own mean as the leaf value) and stores thresholds
+and leaf values at the chosen precision. The report compares size, load
+time, latency and test-split accuracy against the original pickle.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from utils.config import HORIZONS, REGIONS, feature_columns, model_path
+from utils.flat_forest import flat_model_path, flatten_forest, load_flat, write_flat
+from utils.preprocess import add_time_features
+from utils.store import load_merged
+
+REPORT_PATH = "models/compaction_report.csv"
+
+TREE_COUNTS = [300, 100, 50, 25]
+DEPTHS = [18, 14, 12]
+PRECISIONS = ["float32", "float16"]
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def median_ms(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def test_split(region, horizon):
+    # same target and 80/20 split as the training scripts
+    df = add_time_features(load_merged(region))
+    df["target"] = df["demand_mw"].shift(-horizon)
+    df = df.dropna()
+    test = df.iloc[int(len(df) * 0.8):]
+    return test[feature_columns(region)], test["target"].to_numpy()
+
+
+def scores(y, pred):
+    return mean_absolute_error(y, pred), float(np.sqrt(mean_squared_error(y, pred)))
+
+
+def evaluate(region, horizon, variants, workdir):
+    path = model_path(region, horizon)
+    start = time.perf_counter()
+    model = joblib.load(path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    X, y = test_split(region, horizon)
+    X_np = X.to_numpy("float32")
+    row = X.iloc[:1]
+    base_mae, base_rmse = scores(y, model.predict(X))
+    base_size = os.path.getsize(path)
+
+    rows = [{
+        "region": region,
+        "horizon": horizon,
+        "variant": "original",
+        "size_mb": base_size / 1e6,
+        "size_ratio": 1.0,
+        "load_ms": load_ms,
+        "latency_1row_ms": median_ms(lambda: model.predict(row), repeat=5),
+        "mae": base_mae,
+        "rmse": base_rmse,
+        "mae_change_pct": 0.0,
+        "rmse_change_pct": 0.0,
+    }]
+
+    for n_trees, depth, precision in variants:
+        arrays, meta = flatten_forest(model, n_trees=n_trees, max_depth=depth, precision=precision)
+        out_dir = write_flat(arrays, meta, os.path.join(workdir, f"{region}_{horizon}_{n_trees}_{depth}_{precision}"))
+
+        start = time.perf_counter()
+        forest = load_flat(out_dir, mmap=False)
+        variant_load_ms = (time.perf_counter() - start) * 1000
+
+        mae, rmse = scores(y, forest.predict(X_np))
+        size = dir_size(out_dir)
+        rows.append({
+            "region": region,
+            "horizon": horizon,
+            "variant": f"{n_trees}:{depth}:{precision}",
+            "size_mb": size / 1e6,
+            "size_ratio": base_size / size,
+            "load_ms": variant_load_ms,
+            "latency_1row_ms": median_ms(lambda: forest.predict_one(X_np[0])),
+            "mae": mae,
+            "rmse": rmse,
+            "mae_change_pct": (mae - base_mae) / base_mae * 100,
+            "rmse_change_pct": (rmse - base_rmse) / base_rmse * 100,
+        })
+
+    return rows
+
+
+def parse_variant(text):
+    n_trees, depth, precision = text.split(":")
+    return int(n_trees), int(depth), precision
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--regions", nargs="+", default=REGIONS, choices=REGIONS)
+    parser.add_argument("--horizons", nargs="+", type=int, default=HORIZONS)
+    parser.add_argument("--export", type=parse_variant, metavar="TREES:DEPTH:PRECISION",
+                        help="write this variant to models/flat for GRIDGUARD_MODEL_FORMAT=flat")
+    args = parser.parse_args()
+
+    variants = [(n, d, p) for n in TREE_COUNTS for d in DEPTHS for p in PRECISIONS]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for region in args.regions:
+            for horizon in args.horizons:
+                rows.extend(evaluate(region, horizon, variants, workdir))
+                print(f"✅ {region} {horizon}h: {len(variants)} variants evaluated")
+
+    report = pd.DataFrame(rows)
+    report.to_csv(REPORT_PATH, index=False, float_format="%.4f")
+
+    # variants ranked by how much accuracy they give up, averaged over models
+    summary = (
+        report[report["variant"] != "original"]
+        .groupby("variant")[["size_ratio", "mae_change_pct", "rmse_change_pct", "latency_1row_ms"]]
+        .mean()
+        .sort_values("mae_change_pct")
+    )
+    print(summary.round(2).to_string())
+    print(f"Report saved to {REPORT_PATH}")
+
+    if args.export:
+        n_trees, depth, precision = args.export
+        for region in args.regions:
+            for horizon in args.horizons:
+                model = joblib.load(model_path(region, horizon))
+                arrays, meta = flatten_forest(model, n_trees=n_trees, max_depth=depth, precision=precision)
+                out_dir = write_flat(arrays, meta, flat_model_path(region, horizon))
+                print(f"✅ {region} {horizon}h compact model saved to {out_dir} ({dir_size(out_dir) / 1e6:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
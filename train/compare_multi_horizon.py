@@ -0,0 +1,115 @@
+"""Compare the per-horizon forests with the multi-horizon forest of each region.
+
+Run from the project root, after training both layouts:
+
+    python -m train.train_models
+    python -m train.train_models --multi
+    python -m train.compare_multi_horizon
+
+Both layouts are scored on the same test rows (the rows with a target at
+every horizon, last 20%), so the accuracy columns are directly comparable.
+Training time comes from the two training reports, artifact size from the
+pickles on disk, and latency is the time to answer every horizon for one
+row: four predict calls against one. The table is written to
+models/multi_horizon_report.csv.
+"""
+
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from train.train_models import MULTI_REPORT_PATH, REPORT_PATH, split_rows
+from utils.config import HORIZONS, MULTI, REGIONS, feature_columns, model_path
+from utils.preprocess import add_time_features
+from utils.store import load_merged
+
+OUTPUT_PATH = "models/multi_horizon_report.csv"
+
+LATENCY_REPEATS = 50
+
+
+def _fit_seconds(path, region, horizons):
+    """Sum of fit_s for the region's rows of a training report, NaN if missing."""
+    if not os.path.exists(path):
+        return float("nan")
+    report = pd.read_csv(path, dtype={"horizon": str})
+    rows = report[(report["region"] == region) & report["horizon"].isin([str(h) for h in horizons])]
+    return float(rows["fit_s"].sum()) if len(rows) else float("nan")
+
+
+def _latency_ms(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(LATENCY_REPEATS):
+        fn()
+    return (time.perf_counter() - start) / LATENCY_REPEATS * 1000
+
+
+def compare_region(region, horizons=HORIZONS):
+    single = {h: joblib.load(model_path(region, h)) for h in horizons}
+    multi = joblib.load(model_path(region, MULTI))
+    columns = [list(multi.horizons_).index(h) for h in horizons]
+
+    features = feature_columns(region)
+    df = add_time_features(load_merged(region))
+    block = df[features + ["demand_mw"]].to_numpy("float64")
+    _, test = split_rows(block, horizons)
+    X_test = pd.DataFrame(block[test, :-1], columns=features)
+    multi_pred = np.asarray(multi.predict(X_test))[:, columns]
+
+    rows = []
+    for j, h in enumerate(horizons):
+        y = block[test + h, -1]
+        single_pred = single[h].predict(X_test)
+        for layout, pred in (("per-horizon", single_pred), ("multi", multi_pred[:, j])):
+            rows.append({
+                "region": region,
+                "horizon": h,
+                "layout": layout,
+                "mae": mean_absolute_error(y, pred),
+                "rmse": float(np.sqrt(mean_squared_error(y, pred))),
+            })
+
+    one = X_test.iloc[-1:]
+    summary = {
+        "region": region,
+        "per_horizon_fit_s": _fit_seconds(REPORT_PATH, region, horizons),
+        "multi_fit_s": _fit_seconds(MULTI_REPORT_PATH, region, [MULTI]),
+        "per_horizon_size_mb": sum(os.path.getsize(model_path(region, h)) for h in horizons) / 1e6,
+        "multi_size_mb": os.path.getsize(model_path(region, MULTI)) / 1e6,
+        "per_horizon_latency_ms": _latency_ms(lambda: [single[h].predict(one) for h in horizons]),
+        "multi_latency_ms": _latency_ms(lambda: multi.predict(one)),
+    }
+    return rows, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--regions", nargs="+", default=REGIONS, choices=REGIONS)
+    args = parser.parse_args()
+
+    accuracy, summaries = [], []
+    for region in args.regions:
+        rows, summary = compare_region(region)
+        accuracy.extend(rows)
+        summaries.append(summary)
+
+    accuracy = pd.DataFrame(accuracy).pivot_table(
+        index=["region", "horizon"], columns="layout", values=["mae", "rmse"]
+    )
+    accuracy.columns = [f"{layout}_{metric}" for metric, layout in accuracy.columns]
+    report = accuracy.reset_index().merge(pd.DataFrame(summaries), on="region")
+    report.to_csv(OUTPUT_PATH, index=False, float_format="%.3f")
+
+    print(accuracy.round(2).to_string())
+    print(pd.DataFrame(summaries).round(2).to_string(index=False))
+    print(f"✅ Report saved to {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
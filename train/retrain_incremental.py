@@ -0,0 +1,240 @@
+"""Extend the trained forests with the hours that arrived since they were fitted.
+
+Run from the project root, e.g. nightly after merge.ingest:
+
+    python -m train.retrain_incremental
+    python -m train.retrain_incremental --regions Austin --add-trees 25
+    python -m train.retrain_incremental --multi
+
+Each model remembers the last hour it was trained on (trained_through_) and
+its test MAE from the last full fit (reference_mae_); train.train_models
+records both. For every model the newer hours are first scored with the
+model as it is:
+
+- fewer than --min-rows new hours: nothing to do yet
+- MAE on the new hours above --drift-tolerance times the reference: the
+  model has drifted, so it is refitted from scratch on the full history
+  exactly as train.train_models would
+- otherwise the newest --holdout hours are set aside and --add-trees trees
+  are grown with warm_start on the trailing --window-days of history up
+  to them, new hours included. A day of hours alone is far too little for
+  a tree, and a forest made only of such trees ends up much worse than a
+  refit. The grown model and the saved one are both scored on the held-out
+  hours; the grown one is only saved if it is no worse, otherwise the
+  model is refitted. The held-out hours stay after trained_through_, so
+  the next update trains on them. Its held-out MAE is blended into
+  reference_mae_, so the drift check follows the grown model.
+
+The original trees carry the full history and are always kept. Grown trees
+are capped at MAX_GROWN_TREES on top of them (--max-trees sets the total
+instead): once the forest is full the oldest grown trees are dropped as new
+ones arrive, so it never grows without bound. A refit starts over at the
+configured size.
+
+Models without a training record are refitted. Every decision is appended
+to models/incremental_report.csv. Only the calendar models are updated
+here; lag models (train.train_models --lags) are refitted with
+train.train_models --lags.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+
+from train.train_models import fit_one, forest_params, share_region, usable_rows
+from utils.config import HORIZONS, MULTI, REGIONS, feature_columns, model_path
+from utils.csv_append import append_rows
+from utils.preprocess import add_time_features
+from utils.store import load_merged
+
+REPORT_PATH = "models/incremental_report.csv"
+
+ADD_TREES = 50
+# new trees see this much recent history, not just the new hours
+WINDOW_DAYS = 28
+# newest hours kept out of the fit to check the grown model on
+HOLDOUT_HOURS = 24
+MIN_NEW_ROWS = 2 * HOLDOUT_HOURS
+DRIFT_TOLERANCE = 1.25
+# grown trees kept on top of the original ones, the oldest go first
+MAX_GROWN_TREES = 4 * ADD_TREES
+# share of a warm start's held-out MAE in the new reference MAE
+REFERENCE_WEIGHT = 0.25
+
+
+def recent_rows(region, targets, since, window_days):
+    """Feature rows from window_days before `since` on, with a target at every horizon.
+
+    Returns (X, y, origin timestamps); y is 2-D for more than one target.
+    """
+    start = pd.Timestamp(since) - pd.Timedelta(days=window_days) + pd.Timedelta(hours=1)
+    df = add_time_features(load_merged(region, start=start))
+    features = feature_columns(region)
+    block = df[features + ["demand_mw"]].to_numpy("float64")
+    rows = usable_rows(block, targets)
+
+    X = pd.DataFrame(block[rows, :-1], columns=features)
+    y = block[rows[:, None] + np.array(targets), -1]
+    if len(targets) == 1:
+        y = y[:, 0]
+    return X, y, df["timestamp"].to_numpy("datetime64[ns]")[rows]
+
+
+def grow(model, X, y, add_trees, max_trees=None, seed=0):
+    """Add trees fitted on (X, y); beyond max_trees drop the oldest grown ones.
+
+    max_trees defaults to the original trees plus MAX_GROWN_TREES.
+    """
+    increments = getattr(model, "increments_", 0) + 1
+    # trees from the last full fit, the only ones that saw the whole history
+    original = getattr(model, "original_trees_", len(model.estimators_))
+    if max_trees is None:
+        max_trees = original + MAX_GROWN_TREES
+    # a fresh seed per increment, so the new trees don't repeat earlier ones
+    model.set_params(
+        warm_start=True,
+        n_estimators=len(model.estimators_) + add_trees,
+        random_state=seed + increments,
+    )
+    model.fit(X, y)
+    if len(model.estimators_) > max_trees:
+        keep = max(max_trees - original, add_trees)
+        model.estimators_ = model.estimators_[:original] + model.estimators_[original:][-keep:]
+        model.n_estimators = len(model.estimators_)
+    model.set_params(warm_start=False)
+    model.original_trees_ = original
+    model.increments_ = increments
+    return model
+
+
+def save_model(model, path):
+    # the app may load this file at any moment, so swap it in whole
+    tmp = f"{path}.tmp"
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+
+
+def update_one(region, horizon, args):
+    """Score, then extend or mark for refit, one saved model. Returns a report row."""
+    row = {"region": region, "horizon": horizon, "new_rows": 0, "recent_mae": np.nan}
+    path = model_path(region, horizon)
+    if not os.path.exists(path):
+        return {**row, "action": "refit", "reason": "no model"}
+
+    model = joblib.load(path)
+    row["reference_mae"] = getattr(model, "reference_mae_", np.nan)
+    since = getattr(model, "trained_through_", None)
+    if since is None or not hasattr(model, "estimators_"):
+        return {**row, "action": "refit", "reason": "no training record"}
+
+    targets = list(model.horizons_) if horizon == MULTI else [horizon]
+    X, y, origin = recent_rows(region, targets, since, args.window_days)
+    new = origin > np.datetime64(pd.Timestamp(since), "ns")
+    row["new_rows"] = int(new.sum())
+    if row["new_rows"] < args.min_rows:
+        return {**row, "action": "skip", "reason": "too few new hours", "trees": len(model.estimators_)}
+
+    row["recent_mae"] = mean_absolute_error(y[new], model.predict(X[new]))
+    if row["recent_mae"] > args.drift_tolerance * row["reference_mae"]:
+        return {**row, "action": "refit", "reason": "drift"}
+
+    # the newest hours check the grown model, the window before them fits it
+    holdout = np.zeros(len(X), dtype=bool)
+    holdout[np.flatnonzero(new)[-args.holdout:]] = True
+    fit = np.flatnonzero(~holdout)[-args.window_days * 24:]
+    saved_mae = mean_absolute_error(y[holdout], model.predict(X[holdout]))
+
+    params = forest_params(region, horizon)
+    n_jobs = model.n_jobs
+    model.set_params(n_jobs=args.cpus)
+    start = time.perf_counter()
+    grow(model, X.iloc[fit], y[fit], args.add_trees, args.max_trees, seed=params["random_state"])
+    fit_s = time.perf_counter() - start
+    model.set_params(n_jobs=n_jobs)
+
+    row["holdout_mae"] = mean_absolute_error(y[holdout], model.predict(X[holdout]))
+    row["saved_mae"] = saved_mae
+    if row["holdout_mae"] > saved_mae:
+        return {**row, "action": "refit", "reason": "grown model worse on held-out hours"}
+
+    model.trained_through_ = str(np.datetime64(origin[fit[-1]], "h"))
+    if np.isfinite(row["reference_mae"]):
+        model.reference_mae_ = (1 - REFERENCE_WEIGHT) * row["reference_mae"] + REFERENCE_WEIGHT * row["holdout_mae"]
+    else:
+        model.reference_mae_ = row["holdout_mae"]
+    save_model(model, path)
+    return {
+        **row,
+        "action": "warm_start",
+        "reason": "",
+        "trees": len(model.estimators_),
+        "fit_s": fit_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--regions", nargs="+", default=REGIONS, choices=REGIONS)
+    parser.add_argument("--horizons", nargs="+", type=int, default=HORIZONS)
+    parser.add_argument("--multi", action="store_true", help="update the multi-horizon models instead")
+    parser.add_argument("--add-trees", type=int, default=ADD_TREES, help="trees grown per update")
+    parser.add_argument("--max-trees", type=int,
+                        help=f"ensemble size cap, original trees are kept (default: original + {MAX_GROWN_TREES})")
+    parser.add_argument("--window-days", type=int, default=WINDOW_DAYS, help="recent history the new trees fit on")
+    parser.add_argument("--holdout", type=int, default=HOLDOUT_HOURS, help="newest hours held out to check an update")
+    parser.add_argument("--min-rows", type=int, default=MIN_NEW_ROWS, help="new hours needed to update")
+    parser.add_argument("--drift-tolerance", type=float, default=DRIFT_TOLERANCE,
+                        help="refit when recent MAE exceeds this multiple of the reference MAE")
+    parser.add_argument("--cpus", type=int, default=os.cpu_count() or 1, help="threads per fit")
+    args = parser.parse_args()
+    if args.min_rows <= args.holdout:
+        parser.error("--min-rows must be more than --holdout, or no new hours are left to fit on")
+
+    horizons = sorted(args.horizons)
+    fits = [(r, MULTI) for r in args.regions] if args.multi else [(r, h) for r in args.regions for h in horizons]
+
+    rows = []
+    for region, horizon in fits:
+        row = update_one(region, horizon, args)
+        rows.append(row)
+        label = "multi-horizon" if horizon == MULTI else f"{horizon}-Hour"
+        if row["action"] == "warm_start":
+            print(f"✅ {region} {label} model: +{args.add_trees} trees, {row['new_rows']} new hours "
+                  f"({row['trees']} trees, held-out MAE {row['holdout_mae']:.2f} MW, was {row['saved_mae']:.2f})")
+        elif row["action"] == "skip":
+            print(f"{region} {label} model: {row['new_rows']} new hours, skipped")
+
+    refits = [row for row in rows if row["action"] == "refit"]
+    if refits:
+        shared_dir = tempfile.mkdtemp(prefix="gridguard-train-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+        try:
+            blocks = {}
+            for row in refits:
+                region = row["region"]
+                if region not in blocks:
+                    blocks[region] = share_region(region, shared_dir)
+                result = fit_one(region, row["horizon"], blocks[region], args.cpus, horizons)
+                trees = forest_params(region, row["horizon"])["n_estimators"]
+                row.update(trees=trees, fit_s=result["fit_s"], reference_mae=result["mae"])
+                label = "multi-horizon" if row["horizon"] == MULTI else f"{row['horizon']}-Hour"
+                print(f"✅ {region} {label} model refitted ({row['reason']}), MAE: {result['mae']:.2f} MW")
+        finally:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+    columns = ["region", "horizon", "action", "reason", "new_rows", "recent_mae", "reference_mae",
+               "saved_mae", "holdout_mae", "trees", "fit_s"]
+    report = pd.DataFrame(rows).reindex(columns=columns).round(3)
+    report.insert(0, "run_at", pd.Timestamp.now().floor("s"))
+    append_rows(REPORT_PATH, report)
+    print(f"Report appended to {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
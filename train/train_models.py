@@ -0,0 +1,250 @@
+"""Train every region/horizon forest in one run.
+
+Run from the project root:
+
+    python -m train.train_models
+    python -m train.train_models --regions Austin --cpus 4
+    python -m train.train_models --multi
+    python -m train.train_models --lags
+
+Each region's feature matrix is built once and written to shared memory
+(/dev/shm where available); worker processes memory-map it instead of each
+re-reading the data or receiving a pickled copy. Fits are spread over a
+process pool sized to the CPU budget, and each fit
+gets an equal share of the budget as its n_jobs, so processes times threads
+never exceeds the budget. Per-fit timings go to models/training_report.csv,
+replacing the rows of the models just fitted.
+
+--multi fits one forest per region whose target is every horizon at once
+(a 2-D y), saved as models/<region>_model_multi.pkl with its horizons in
+horizons_. The forest shares its splits across horizons, so it is one fit
+and one predict instead of four; the report goes to
+models/training_report_multi.csv. train.compare_multi_horizon weighs the
+two layouts against each other.
+
+--lags adds the lag and rolling-window features of utils.streaming
+(config.lag_columns()) and saves models/<region>_model_<h>h_lags.pkl, the models
+the streaming forecaster serves; combine with --multi for one per region.
+Rows whose windows reach before the start of the history or across a gap
+are left out, and so are rows whose target hour is missing: the target is
+the row exactly h hours later by the clock, as the lag features count
+hours, not the h-th row after. Reports get a _lags suffix.
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from utils.config import HORIZONS, MULTI, REGIONS, feature_columns, model_path
+from utils.preprocess import add_lag_features, add_time_features
+from utils.store import load_merged
+
+REPORT_PATH = "models/training_report.csv"
+MULTI_REPORT_PATH = "models/training_report_multi.csv"
+HYPERPARAMS_PATH = "train/hyperparams.json"
+
+# train/test split, and the forest settings of models train.tune_hyperparams
+# has no tuned settings for
+TRAIN_FRACTION = 0.8
+FOREST_PARAMS = {"n_estimators": 300, "max_depth": 18, "random_state": 42}
+
+
+def forest_params(region, horizon):
+    """FOREST_PARAMS overlaid with the tuned settings in HYPERPARAMS_PATH, if any."""
+    params = dict(FOREST_PARAMS)
+    if os.path.exists(HYPERPARAMS_PATH):
+        with open(HYPERPARAMS_PATH) as f:
+            tuned = json.load(f)
+        params.update(tuned.get(region, {}).get(str(horizon), {}))
+    return params
+
+
+def share_region(region, shared_dir, lags=False):
+    """Write the region's features plus demand as one memory-mappable block.
+
+    Column order is feature_columns(region, lags) followed by demand_mw, which the
+    workers shift to build each horizon's target. float64 so targets match
+    the source exactly; the forest casts features to float32 itself.
+    """
+    df = add_time_features(load_merged(region))
+    if lags:
+        df = add_lag_features(df, region)
+    block = df[feature_columns(region, lags) + ["demand_mw"]].to_numpy("float64")
+
+    path = os.path.join(shared_dir, f"{region.lower()}.npy")
+    np.save(path, block)
+    np.save(hours_path(path), df["timestamp"].to_numpy("datetime64[h]").astype("int64"))
+    return path
+
+
+def hours_path(block_path):
+    # row timestamps (hours since the epoch) next to a shared block
+    return block_path.replace(".npy", "_hours.npy")
+
+
+def usable_rows(block, horizons, hours=None):
+    """Rows of a block with a full feature row and a target at every horizon.
+
+    Same rows as shift(-horizon) + dropna for each horizon. With the block's
+    hours (hours_path), a row is also dropped when the row h further on is
+    not h hours later, i.e. a gap lies between the two.
+    """
+    demand = block[:, -1]
+    rows = np.arange(max(len(block) - max(horizons), 0))
+    keep = np.isfinite(block[rows, :-1]).all(axis=1)
+    for h in horizons:
+        keep &= np.isfinite(demand[rows + h])
+        if hours is not None:
+            keep &= hours[rows + h] - hours[rows] == h
+    return rows[keep]
+
+
+def split_rows(block, horizons, hours=None):
+    """Train and test row indices of a shared block for the given horizons.
+
+    For a single horizon and no hours this is exactly the per-horizon
+    scripts' split.
+    """
+    rows = usable_rows(block, horizons, hours)
+    split = int(len(rows) * TRAIN_FRACTION)
+    return rows[:split], rows[split:]
+
+
+def fit_one(region, horizon, block_path, n_jobs, horizons=None, lags=False):
+    """Fit, score and save one model; runs in a worker process.
+
+    horizon is an hour count, or MULTI with horizons listing the targets
+    of a multi-horizon model.
+    """
+    start = time.perf_counter()
+    block = np.load(block_path, mmap_mode="r")
+    features = feature_columns(region, lags)
+    demand = block[:, -1]
+    targets = list(horizons) if horizon == MULTI else [horizon]
+    hours = np.load(hours_path(block_path), mmap_mode="r")
+
+    # lag features count clock hours, so their targets must too
+    train, test = split_rows(block, targets, hours if lags else None)
+    X_train = pd.DataFrame(block[train, :-1], columns=features)
+    X_test = pd.DataFrame(block[test, :-1], columns=features)
+    shifts = np.array(targets)
+    y_train = demand[train[:, None] + shifts]
+    y_test = demand[test[:, None] + shifts]
+    if horizon != MULTI:
+        y_train, y_test = y_train[:, 0], y_test[:, 0]
+    del block, demand
+    prep_s = time.perf_counter() - start
+
+    model = RandomForestRegressor(**forest_params(region, horizon), n_jobs=n_jobs)
+    fit_start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - fit_start
+
+    pred = model.predict(X_test)
+    mae = mean_absolute_error(y_test, pred)
+    if horizon == MULTI:
+        model.horizons_ = targets
+    # what train.retrain_incremental needs to extend the model later
+    model.trained_through_ = str(np.datetime64(int(hours[train[-1]]), "h"))
+    model.reference_mae_ = mae
+    joblib.dump(model, model_path(region, horizon, lags))
+
+    # a multi-horizon model reports its error averaged over the horizons
+    return {
+        "region": region,
+        "horizon": horizon,
+        "pid": os.getpid(),
+        "n_jobs": n_jobs,
+        "train_rows": len(train),
+        "prep_s": prep_s,
+        "fit_s": fit_s,
+        "total_s": time.perf_counter() - start,
+        "mae": mae,
+        "rmse": float(np.sqrt(mean_squared_error(y_test, pred))),
+        "worker_peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def save_report(report, path):
+    """Replace the rows of the models in report, keeping the others' last results."""
+    if os.path.exists(path):
+        old = pd.read_csv(path)
+        fitted = set(zip(report["region"], report["horizon"].astype(str)))
+        kept = old[[key not in fitted for key in zip(old["region"], old["horizon"].astype(str))]]
+        report = pd.concat([kept, report], ignore_index=True)
+    report.to_csv(path, index=False, float_format="%.3f")
+
+
+def plan(n_fits, cpus, fit_jobs=None):
+    """(processes, n_jobs per fit) that keep processes * n_jobs <= cpus."""
+    if fit_jobs:
+        return max(1, min(n_fits, cpus // fit_jobs)), fit_jobs
+    processes = max(1, min(n_fits, cpus))
+    return processes, max(1, cpus // processes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--regions", nargs="+", default=REGIONS, choices=REGIONS)
+    parser.add_argument("--horizons", nargs="+", type=int, default=HORIZONS)
+    parser.add_argument("--cpus", type=int, default=os.cpu_count() or 1, help="CPU budget for the whole run")
+    parser.add_argument("--fit-jobs", type=int, help="threads per fit (default: an equal share of --cpus)")
+    parser.add_argument("--multi", action="store_true", help="one multi-horizon model per region")
+    parser.add_argument("--lags", action="store_true", help="add lag and rolling-window features")
+    args = parser.parse_args()
+    horizons = sorted(args.horizons)
+    report_path = MULTI_REPORT_PATH if args.multi else REPORT_PATH
+    if args.lags:
+        report_path = report_path.replace(".csv", "_lags.csv")
+
+    started = time.perf_counter()
+    if args.multi:
+        fits = [(r, MULTI) for r in args.regions]
+    else:
+        fits = [(r, h) for r in args.regions for h in horizons]
+    processes, n_jobs = plan(len(fits), args.cpus, args.fit_jobs)
+    print(f"{len(fits)} fits on {processes} processes x {n_jobs} threads (budget {args.cpus} CPUs)")
+
+    shared_dir = tempfile.mkdtemp(prefix="gridguard-train-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    rows = []
+    try:
+        blocks = {region: share_region(region, shared_dir, args.lags) for region in args.regions}
+        prep_s = time.perf_counter() - started
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(fit_one, r, h, blocks[r], n_jobs, horizons, args.lags) for r, h in fits]
+            for future in as_completed(futures):
+                row = future.result()
+                rows.append(row)
+                label = "multi-horizon" if row["horizon"] == MULTI else f"{row['horizon']}-Hour"
+                print(f"✅ {row['region']} {label} model trained in {row['fit_s']:.1f}s")
+                print(f"MAE: {row['mae']:.2f} MW | RMSE: {row['rmse']:.2f} MW")
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    wall_s = time.perf_counter() - started
+    report = pd.DataFrame(rows).sort_values(["region", "horizon"])
+    save_report(report, report_path)
+
+    own_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(report[["region", "horizon", "pid", "fit_s", "total_s", "mae", "rmse"]].round(2).to_string(index=False))
+    print(f"Feature matrices built in {prep_s:.1f}s")
+    print(f"Wall time: {wall_s:.1f}s | sum of fit times: {report['fit_s'].sum():.1f}s")
+    print(f"Peak RSS: driver {own_rss:,.0f} MB, largest worker {child_rss:,.0f} MB")
+    print(f"Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
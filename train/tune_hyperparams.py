@@ -0,0 +1,154 @@
+"""Search forest settings per region and horizon with successive halving.
+
+Run from the project root:
+
+    python -m train.tune_hyperparams
+    python -m train.tune_hyperparams --regions Austin --horizons 1 24 --candidates 60
+    python -m train.tune_hyperparams --multi
+
+Only the rows train.train_models fits on (the first 80% of each region's
+history) are searched, so its test split stays unseen. Candidates are drawn
+from SEARCH_SPACE and scored by MAE on TimeSeriesSplit folds, each of which
+validates on hours after the ones it trained on. HalvingRandomSearchCV
+starts every candidate on a small slice of each fold's training rows and
+keeps the best third for the next round with three times the rows, so
+poor settings are dropped cheaply and the full data only goes to the few
+that survive. Candidate fits run in parallel over --cpus processes.
+
+The winning settings are merged into train/hyperparams.json, which
+train.train_models reads over its defaults. Every candidate of every round
+(rows used, fit seconds, MAE) is appended to models/tuning_log.csv.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, TimeSeriesSplit
+
+from train.train_models import FOREST_PARAMS, HYPERPARAMS_PATH, split_rows
+from utils.config import HORIZONS, MULTI, REGIONS, feature_columns
+from utils.csv_append import append_rows
+from utils.preprocess import add_time_features
+from utils.store import load_merged
+
+LOG_PATH = "models/tuning_log.csv"
+
+# max_features and max_samples are the feature and row sampling per tree
+SEARCH_SPACE = {
+    "n_estimators": [100, 200, 300, 500],
+    "max_depth": [10, 14, 18, 24, None],
+    "min_samples_leaf": [1, 2, 5, 10],
+    "max_features": [1.0, 0.8, 0.6, "sqrt"],
+    "max_samples": [None, 0.8, 0.5],
+}
+
+N_CANDIDATES = 40
+CV_SPLITS = 4
+FACTOR = 3
+# the first round trains on about a month of hours per fold
+MIN_RESOURCES = 24 * 30
+
+
+def training_data(region, horizons):
+    """The train split of a region as (X, y), y 2-D for several horizons."""
+    features = feature_columns(region)
+    df = add_time_features(load_merged(region))
+    block = df[features + ["demand_mw"]].to_numpy("float64")
+    train, _ = split_rows(block, horizons)
+
+    X = pd.DataFrame(block[train, :-1], columns=features)
+    y = block[train[:, None] + np.array(horizons), -1]
+    return X, y[:, 0] if len(horizons) == 1 else y
+
+
+def tune(region, horizon, args):
+    """Run the search for one model; returns (best params, log rows, seconds)."""
+    X, y = training_data(region, args.horizons if horizon == MULTI else [horizon])
+
+    search = HalvingRandomSearchCV(
+        RandomForestRegressor(random_state=FOREST_PARAMS["random_state"], n_jobs=1),
+        SEARCH_SPACE,
+        n_candidates=args.candidates,
+        factor=FACTOR,
+        resource="n_samples",
+        min_resources=MIN_RESOURCES,
+        cv=TimeSeriesSplit(n_splits=CV_SPLITS),
+        scoring="neg_mean_absolute_error",
+        refit=False,
+        random_state=FOREST_PARAMS["random_state"],
+        n_jobs=args.cpus,
+    )
+    start = time.perf_counter()
+    search.fit(X, y)
+    seconds = time.perf_counter() - start
+
+    results = search.cv_results_
+    log = pd.DataFrame({
+        "region": region,
+        "horizon": horizon,
+        "iter": results["iter"],
+        "n_resources": results["n_resources"],
+        "params": [json.dumps(p, sort_keys=True) for p in results["params"]],
+        "mae": -results["mean_test_score"],
+        "mae_std": results["std_test_score"],
+        "fit_s": results["mean_fit_time"] * CV_SPLITS,
+        "score_s": results["mean_score_time"] * CV_SPLITS,
+    })
+    return search.best_params_, log, seconds
+
+
+def save_hyperparams(best):
+    """Merge {region: {horizon: params}} into HYPERPARAMS_PATH."""
+    tuned = {}
+    if os.path.exists(HYPERPARAMS_PATH):
+        with open(HYPERPARAMS_PATH) as f:
+            tuned = json.load(f)
+    for region, by_horizon in best.items():
+        for horizon, params in by_horizon.items():
+            tuned.setdefault(region, {})[str(horizon)] = params
+
+    tmp = f"{HYPERPARAMS_PATH}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(tuned, f, indent=2, sort_keys=True)
+    os.replace(tmp, HYPERPARAMS_PATH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--regions", nargs="+", default=REGIONS, choices=REGIONS)
+    parser.add_argument("--horizons", nargs="+", type=int, default=HORIZONS)
+    parser.add_argument("--multi", action="store_true", help="tune the multi-horizon models instead")
+    parser.add_argument("--candidates", type=int, default=N_CANDIDATES, help="settings drawn for the first round")
+    parser.add_argument("--cpus", type=int, default=os.cpu_count() or 1, help="parallel candidate fits")
+    args = parser.parse_args()
+    args.horizons = sorted(args.horizons)
+
+    models = [(r, MULTI) for r in args.regions] if args.multi else [(r, h) for r in args.regions for h in args.horizons]
+
+    best = {}
+    for region, horizon in models:
+        params, log, seconds = tune(region, horizon, args)
+        best.setdefault(region, {})[horizon] = params
+
+        log = log.round(3)
+        log.insert(0, "tuned_at", pd.Timestamp.now().floor("s"))
+        append_rows(LOG_PATH, log)
+
+        final = log[log["iter"] == log["iter"].max()]
+        label = "multi-horizon" if horizon == MULTI else f"{horizon}-Hour"
+        print(f"✅ {region} {label}: {len(log)} fits over {log['iter'].max() + 1} rounds in {seconds:.0f}s, "
+              f"best CV MAE {final['mae'].min():.2f} MW")
+        print(f"   {json.dumps(params, sort_keys=True)}")
+
+    save_hyperparams(best)
+    print(f"Settings saved to {HYPERPARAMS_PATH}, search log appended to {LOG_PATH}")
+
+
+if __name__ == "__main__":
+    main()
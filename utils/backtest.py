@@ -0,0 +1,261 @@
+# utils/backtest.py
+
+# rolling-origin backtests. Every hour of a region's history is a forecast
+# origin for every horizon, so a year of data is ~8,700 forecasts per model
+# instead of the last 20% of one split. All origins of a model go through a
+# single predict call, and regions run in parallel processes.
+#
+# two evaluations:
+#   saved         the models as served, at every origin; the rows they were
+#                 trained on are flagged, and "saved_holdout" only counts
+#                 the others
+#   walk_forward  refit before every block of --walk-forward months on all
+#                 hours whose targets are before the block, then forecast
+#                 the block; every forecast is out of sample
+#
+# per-origin forecasts go to the store (backtest/<evaluation>/<region>_<h>h)
+# and MAE/RMSE/MAPE overall and by month, hour of day and demand decile to
+# data/backtest/summary.csv, which the app's Backtest page reads.
+#
+#     python -m utils.backtest
+#     python -m utils.backtest --regions Austin --walk-forward 1
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils import store
+from utils.config import HORIZONS, REGIONS, feature_columns
+from utils.preprocess import add_time_features
+
+BACKTEST_DIR = "data/backtest"
+SUMMARY_PATH = os.path.join(BACKTEST_DIR, "summary.csv")
+
+BREAKDOWNS = ["month", "hour", "decile"]
+
+# same split as the training driver, for models that don't record theirs
+TRAIN_FRACTION = 0.8
+
+# walk-forward refits only start once this much history is available
+MIN_TRAIN_MONTHS = 3
+
+
+def dataset(evaluation, region, horizon):
+    return f"backtest/{evaluation}/{region.lower()}_{horizon}h"
+
+
+def _metrics(target, pred):
+    err = pred - target
+    return {
+        "n": len(err),
+        "mae": float(np.abs(err).mean()),
+        "rmse": float(np.sqrt((err ** 2).mean())),
+        "mape": float((np.abs(err) / np.abs(target)).mean() * 100),
+    }
+
+
+def summarize(timestamp, target, pred):
+    """Overall metrics plus one row per month, hour of day and demand decile."""
+    ts = pd.DatetimeIndex(timestamp)
+    groups = {
+        "month": ts.month.to_numpy(),
+        "hour": ts.hour.to_numpy(),
+        # deciles of the actual demand at the target hour
+        "decile": pd.qcut(target, 10, labels=False, duplicates="drop") + 1,
+    }
+    rows = [{"breakdown": "all", "bucket": 0, **_metrics(target, pred)}]
+    for name in BREAKDOWNS:
+        keys = groups[name]
+        for bucket in np.unique(keys):
+            mask = keys == bucket
+            rows.append({"breakdown": name, "bucket": int(bucket), **_metrics(target[mask], pred[mask])})
+    return pd.DataFrame(rows)
+
+
+def _origins(region):
+    """Timestamps, feature frame and demand of every origin with a full feature row."""
+    df = add_time_features(store.load_merged(region))
+    features = feature_columns(region)
+    ok = df[features].notna().all(axis=1).to_numpy()
+    positions = np.flatnonzero(ok)
+    X = df[features].iloc[positions].reset_index(drop=True)
+    return df["timestamp"].to_numpy("datetime64[ns]"), X, positions, df["demand_mw"].to_numpy("float64")
+
+
+def _with_target(positions, demand, horizon):
+    # origins (indices into positions) whose target hour exists and is known
+    ahead = positions + horizon
+    inside = ahead < len(demand)
+    keep = np.zeros(len(positions), dtype=bool)
+    keep[inside] = np.isfinite(demand[ahead[inside]])
+    return np.flatnonzero(keep)
+
+
+def _training_cutoff(model, n_rows):
+    """Last origin timestamp the model was fitted on, or the row index of the split."""
+    through = getattr(model, "trained_through_", None)
+    if through is not None:
+        return np.datetime64(pd.Timestamp(through), "ns")
+    return int(n_rows * TRAIN_FRACTION)
+
+
+def saved_forecasts(region, horizons, registry):
+    """{horizon: frame of timestamp, target, pred, in_train} with the served models."""
+    ts, X, positions, demand = _origins(region)
+
+    multi = registry.horizon_model(region)
+    if multi is not None:
+        # one predict answers every horizon
+        all_preds = np.asarray(multi.predict(X))
+        columns = {h: list(multi.horizons_).index(h) for h in horizons}
+
+    out = {}
+    for h in horizons:
+        idx = _with_target(positions, demand, h)
+        if multi is not None:
+            pred, model = all_preds[idx, columns[h]], multi
+        else:
+            model = registry.get(region, h)
+            pred = np.asarray(model.predict(X.iloc[idx]), dtype="float64")
+
+        origin = ts[positions[idx]]
+        cutoff = _training_cutoff(model, len(idx))
+        if isinstance(cutoff, int):
+            in_train = np.arange(len(idx)) < cutoff
+        else:
+            in_train = origin <= cutoff
+        out[h] = pd.DataFrame({
+            "timestamp": origin,
+            "target": demand[positions[idx] + h],
+            "pred": pred,
+            "in_train": in_train.astype("float64"),
+        })
+    return out
+
+
+def walk_forward_forecasts(region, horizons, months, n_jobs=1):
+    """{horizon: frame of timestamp, target, pred} from expanding-window refits."""
+    from sklearn.ensemble import RandomForestRegressor
+
+    from train.train_models import forest_params
+
+    ts, X, positions, demand = _origins(region)
+    month_starts = np.unique(ts.astype("datetime64[M]"))
+    fold_starts = month_starts[MIN_TRAIN_MONTHS::months].astype("datetime64[ns]")
+    fold_ends = np.append(fold_starts[1:], np.datetime64("NaT"))
+
+    out = {}
+    for h in horizons:
+        idx = _with_target(positions, demand, h)
+        origin = ts[positions[idx]]
+        target_time = ts[positions[idx] + h]
+        y = demand[positions[idx] + h]
+
+        pieces = []
+        for start, end in zip(fold_starts, fold_ends):
+            train = target_time < start
+            fold = (origin >= start) & (np.isnat(end) | (origin < end))
+            if not train.any() or not fold.any():
+                continue
+            model = RandomForestRegressor(**forest_params(region, h), n_jobs=n_jobs)
+            model.fit(X.iloc[idx[train]], y[train])
+            pieces.append(pd.DataFrame({
+                "timestamp": origin[fold],
+                "target": y[fold],
+                "pred": model.predict(X.iloc[idx[fold]]),
+            }))
+        out[h] = pd.concat(pieces, ignore_index=True) if pieces else pd.DataFrame(
+            columns=["timestamp", "target", "pred"]
+        )
+    return out
+
+
+def backtest_region(region, horizons=HORIZONS, walk_forward=None, n_jobs=1):
+    """Run the evaluations for one region, store the forecasts, return its summary rows."""
+    from utils.model_registry import ModelRegistry
+
+    results = {"saved": saved_forecasts(region, horizons, ModelRegistry())}
+    if walk_forward:
+        results["walk_forward"] = walk_forward_forecasts(region, horizons, walk_forward, n_jobs)
+
+    summaries = []
+    for evaluation, by_horizon in results.items():
+        for h, frame in by_horizon.items():
+            if frame.empty:
+                continue
+            store.write_frame(dataset(evaluation, region, h), frame)
+            segments = {evaluation: frame}
+            if "in_train" in frame:
+                segments[f"{evaluation}_holdout"] = frame[frame["in_train"] == 0]
+            for name, rows in segments.items():
+                if rows.empty:
+                    continue
+                summary = summarize(rows["timestamp"], rows["target"].to_numpy(), rows["pred"].to_numpy())
+                summary.insert(0, "evaluation", name)
+                summary.insert(0, "horizon", h)
+                summary.insert(0, "region", region)
+                summaries.append(summary)
+    return pd.concat(summaries, ignore_index=True) if summaries else pd.DataFrame()
+
+
+def save_summary(summary):
+    """Replace the summary rows of the regions and evaluations in summary."""
+    if os.path.exists(SUMMARY_PATH):
+        old = pd.read_csv(SUMMARY_PATH)
+        done = old.set_index(["region", "evaluation"]).index.isin(
+            summary.set_index(["region", "evaluation"]).index
+        )
+        summary = pd.concat([old[~done], summary], ignore_index=True)
+    summary = summary.sort_values(["region", "horizon", "evaluation", "breakdown", "bucket"])
+
+    os.makedirs(BACKTEST_DIR, exist_ok=True)
+    tmp = f"{SUMMARY_PATH}.tmp"
+    summary.to_csv(tmp, index=False, float_format="%.3f")
+    os.replace(tmp, SUMMARY_PATH)
+    return summary
+
+
+def load_summary(region=None, horizon=None):
+    """Saved backtest metrics, empty if no backtest has been run."""
+    if not os.path.exists(SUMMARY_PATH):
+        return pd.DataFrame()
+    summary = pd.read_csv(SUMMARY_PATH)
+    if region is not None:
+        summary = summary[summary["region"] == region]
+    if horizon is not None:
+        summary = summary[summary["horizon"] == horizon]
+    return summary.reset_index(drop=True)
+
+
+def run(regions=REGIONS, horizons=HORIZONS, walk_forward=None, cpus=None):
+    cpus = cpus or os.cpu_count() or 1
+    processes = max(1, min(len(regions), cpus))
+    n_jobs = max(1, cpus // processes)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {
+            region: pool.submit(backtest_region, region, horizons, walk_forward, n_jobs)
+            for region in regions
+        }
+        summary = pd.concat([f.result() for f in futures.values()], ignore_index=True)
+    return save_summary(summary)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the forecast models.")
+    parser.add_argument("--regions", nargs="+", default=REGIONS, choices=REGIONS)
+    parser.add_argument("--horizons", nargs="+", type=int, default=HORIZONS)
+    parser.add_argument("--walk-forward", type=int, metavar="MONTHS",
+                        help="also refit every MONTHS months on an expanding window")
+    parser.add_argument("--cpus", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = run(args.regions, sorted(args.horizons), args.walk_forward, args.cpus)
+    overall = summary[(summary["breakdown"] == "all") & summary["region"].isin(args.regions)]
+    print(overall[["region", "horizon", "evaluation", "n", "mae", "rmse", "mape"]].round(2).to_string(index=False))
+    print(f"✅ Backtest finished in {time.perf_counter() - started:.1f}s, summary saved to {SUMMARY_PATH}")
@@ -0,0 +1,70 @@
+# utils/batching.py
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from utils.quantile_sketch import QuantileSketch
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into one batched call.
+
+    Callers submit one feature row and get a Future back. A worker thread
+    waits up to `max_wait_ms` after the first queued row for more rows to
+    arrive (or until `max_batch` rows are queued), stacks them and calls
+    `predict_fn` once for the whole batch.
+    """
+
+    def __init__(self, predict_fn, max_batch=256, max_wait_ms=5.0, name="batcher"):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batch_sizes = QuantileSketch()
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, row):
+        future = Future()
+        self._queue.put((np.asarray(row, dtype="float64"), future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # anything that goes wrong fails this batch's futures, never the
+            # worker, or every later request would wait forever
+            try:
+                rows = np.vstack([row for row, _ in batch])
+                preds = [float(p) for p in self.predict_fn(rows)]
+                if len(preds) != len(batch):
+                    raise ValueError(f"predict returned {len(preds)} values for {len(batch)} rows")
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            self.rows += len(batch)
+            self.batch_sizes.add([len(batch)])
+            for (_, future), pred in zip(batch, preds):
+                future.set_result(pred)
@@ -0,0 +1,173 @@
+# utils/charts.py
+
+import numpy as np
+
+# matplotlib and altair are imported inside each function so pages without
+# a chart never pay for them
+
+# points per series sent to the browser, about one per horizontal pixel
+MAX_POINTS = 1000
+
+
+def _mw_formatter():
+    from matplotlib.ticker import FuncFormatter
+    return FuncFormatter(lambda x, _: f"{int(x):,}")
+
+
+def projection_figure(demand, prediction, horizon):
+    import matplotlib.pyplot as plt
+
+    upper = prediction * 1.1
+    lower = prediction * 0.9
+
+    fig, ax = plt.subplots()
+    ax.plot(["Now", f"+{horizon}h"], [demand, prediction], marker="o", linewidth=3)
+    ax.fill_between(
+        ["Now", f"+{horizon}h"],
+        [demand, lower],
+        [demand, upper],
+        alpha=0.2,
+        label="Confidence Range"
+    )
+    ax.set_ylabel("Demand (MW)")
+    ax.set_title("Future Demand Projection")
+    ax.yaxis.set_major_formatter(_mw_formatter())
+    ax.grid(alpha=0.3)
+    ax.legend()
+    return fig
+
+
+def lttb(x, y, n_out):
+    """Largest-triangle-three-buckets downsampling, returns kept indices.
+
+    Keeps the first and last point and, from each of n_out - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket. Peaks and dips
+    survive, which plain striding would drop.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(1, n - 1, n_out - 1).astype("int64")
+
+    # bucket means only depend on the data, so compute them all up front
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    mean_x = np.append(sums_x / counts, x[-1])
+    mean_y = np.append(sums_y / counts, y[-1])
+
+    keep = np.empty(n_out, dtype="int64")
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        # twice the triangle area, the constant factor doesn't change argmax
+        area = np.abs((x[a] - mean_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (mean_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def validation_chart_spec(timestamps, actual, pred, max_points=MAX_POINTS):
+    """Interactive actual-vs-predicted chart as a Vega-Lite spec.
+
+    Each series is reduced to max_points with LTTB before it goes into the
+    spec, so the payload and browser work stay flat however long the
+    window is. Zoom and pan (x only) run client-side.
+    """
+    import altair as alt
+    import pandas as pd
+
+    t = np.asarray(timestamps, dtype="int64")
+    frames = []
+    for label, values in (("Actual", actual), ("Predicted", pred)):
+        keep = lttb(t, values, max_points)
+        frames.append(pd.DataFrame({
+            "time": pd.to_datetime(t[keep]),
+            "demand_mw": np.asarray(values)[keep],
+            "series": label,
+        }))
+    data = pd.concat(frames, ignore_index=True)
+
+    chart = alt.Chart(data).mark_line().encode(
+        x=alt.X("time:T", title="Time"),
+        y=alt.Y("demand_mw:Q", title="Demand (MW)", scale=alt.Scale(zero=False),
+                axis=alt.Axis(format=",.0f")),
+        color=alt.Color("series:N", title=None),
+        strokeDash=alt.StrokeDash("series:N", legend=None),
+        tooltip=[alt.Tooltip("time:T"), "series", alt.Tooltip("demand_mw:Q", format=",.0f")]
+    ).properties(height=380).interactive(bind_y=False)
+    return chart.to_dict()
+
+
+def risk_heatmap(table, horizons):
+    import altair as alt
+
+    heatmap = alt.Chart(table).mark_rect().encode(
+        x=alt.X("horizon:N", sort=[f"+{h}h" for h in horizons], title="Horizon"),
+        y=alt.Y("region:N", title=None),
+        color=alt.Color(
+            "risk:N",
+            scale=alt.Scale(
+                domain=["🟢 Low Risk", "🟡 Medium Risk", "🔴 High Risk"],
+                range=["#4caf50", "#ffc107", "#e53935"]
+            ),
+            title="Risk"
+        ),
+        tooltip=["region", "horizon", alt.Tooltip("forecast_mw:Q", format=",.0f"), "risk", "reason"]
+    )
+    labels = heatmap.mark_text(fontSize=14).encode(
+        text=alt.Text("forecast_mw:Q", format=",.0f"),
+        color=alt.value("black")
+    )
+    return (heatmap + labels).properties(height=220)
+
+
+def figure_png(fig, dpi=100):
+    """Render a matplotlib figure to PNG bytes and free it."""
+    import io
+
+    import matplotlib.pyplot as plt
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def sweep_figure(surface, days, temperatures, pcts):
+    """Forecast heatmap of hour of day x temperature, one panel per day.
+
+    Contours mark the region's risk-band percentiles (p10/p25 low side,
+    p75/p90 high side), so each panel shows where a scenario crosses into
+    medium or high risk.
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    fig, axes = plt.subplots(
+        1, len(days), figsize=(4 * len(days), 4), sharey=True, squeeze=False, layout="constrained"
+    )
+    vmin, vmax = float(surface.min()), float(surface.max())
+    levels = [pcts[k] for k in ("p10", "p25", "p75", "p90")]
+    hours = np.arange(surface.shape[1])
+
+    for ax, day, grid in zip(axes[0], days, surface):
+        image = ax.pcolormesh(temperatures, hours, grid, cmap="viridis", vmin=vmin, vmax=vmax, shading="nearest")
+        # a contour level outside the surface's range would only raise a warning
+        inside = [v for v in levels if grid.min() < v < grid.max()]
+        if inside:
+            lines = ax.contour(temperatures, hours, grid, levels=inside, colors="white", linewidths=1)
+            names = {v: k for k, v in zip(("p10", "p25", "p75", "p90"), levels)}
+            ax.clabel(lines, fmt=lambda v: names.get(v, f"{v:,.0f}"), fontsize=8)
+        ax.set_title(pd.Timestamp(day).strftime("%a %b %d"))
+        ax.set_xlabel("Temperature (°C)")
+    axes[0][0].set_ylabel("Hour of Day")
+    axes[0][0].set_yticks(range(0, 24, 3))
+    fig.colorbar(image, ax=axes[0].tolist(), label="Forecast Demand (MW)", format=_mw_formatter())
+    return fig
@@ -0,0 +1,69 @@
+# utils/config.py
+
+# regions, forecast horizons and where each region's data and models live
+REGIONS = ["Austin", "Dallas", "Houston"]
+HORIZONS = [1, 3, 6, 24]
+
+# horizon name of the per-region model that predicts every horizon at once
+MULTI = "multi"
+
+# lag and rolling-window features of the lag models (train.train_models
+# --lags, served by utils.streaming). Windows end at, and include, the
+# current hour; "temp" is the region's temp_col
+LAG_HOURS = [1, 2, 24, 168]
+ROLLING_FEATURES = [
+    ("demand", "mean", 24),
+    ("demand", "max", 24),
+    ("demand", "mean", 168),
+    ("temp", "mean", 24),
+]
+
+CONFIG = {
+    "Austin": {
+        "data": "data/merged/austin_scent_merged.csv",
+        "temp_col": "austin_temp_c",
+        "model": "models/austin_model",
+        "zone": "SCENT"
+    },
+    "Dallas": {
+        "data": "data/merged/dallas_ncent_merged.csv",
+        "temp_col": "temp_c",
+        "model": "models/dallas_model",
+        "zone": "NCENT"
+    },
+    "Houston": {
+        "data": "data/merged/houston_coast_merged.csv",
+        "temp_col": "temp_c",
+        "model": "models/houston_model",
+        "zone": "COAST"
+    }
+}
+
+
+def model_path(region, horizon, lags=False):
+    suffix = MULTI if horizon == MULTI else f"{horizon}h"
+    if lags:
+        suffix += "_lags"
+    return f"{CONFIG[region]['model']}_{suffix}.pkl"
+
+
+def lag_columns():
+    return [f"demand_lag_{h}h" for h in LAG_HOURS] + [
+        f"{source}_{stat}_{window}h" for source, stat, window in ROLLING_FEATURES
+    ]
+
+
+def feature_columns(region, lags=False):
+    # same column order the models were trained with, the lag models add
+    # lag_columns() at the end
+    columns = [
+        "demand_mw",
+        CONFIG[region]["temp_col"],
+        "sin_hour",
+        "cos_hour",
+        "dayofweek",
+        "is_weekend",
+        "sin_doy",
+        "cos_doy",
+    ]
+    return columns + lag_columns() if lags else columns
@@ -0,0 +1,57 @@
+# utils/csv_append.py
+
+import io
+import os
+
+import pandas as pd
+
+BLOCK_BYTES = 1 << 16
+
+
+def read_tail(path, n_rows):
+    """Last n_rows data rows of a time-ordered CSV, reading from the end.
+
+    Only as many blocks as the rows need are read, so the cost doesn't
+    grow with the length of the file.
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        # one extra newline so the first, possibly partial, line can be dropped
+        while pos > start and data.count(b"\n") <= n_rows:
+            step = min(BLOCK_BYTES, pos - start)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+
+    lines = data.splitlines()
+    if pos > start:
+        lines = lines[1:]
+    lines = lines[-n_rows:] if n_rows else []
+    return pd.read_csv(io.BytesIO(header + b"\n".join(lines)), parse_dates=["timestamp"])
+
+
+def last_timestamp(path):
+    """Timestamp of the last row, None for a missing or empty file."""
+    if not os.path.exists(path):
+        return None
+    tail = read_tail(path, 1)
+    return tail["timestamp"].iloc[0] if len(tail) else None
+
+
+def append_rows(path, df):
+    """Append rows in the file's own column order, writing a header if new."""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        df.to_csv(path, index=False)
+        return
+
+    with open(path, "rb+") as f:
+        columns = f.readline().decode().strip().split(",")
+        # a file saved without a trailing newline would glue the first row on
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+    df[columns].to_csv(path, mode="a", header=False, index=False)
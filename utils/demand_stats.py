@@ -0,0 +1,156 @@
+# utils/demand_stats.py
+
+import json
+import os
+
+import pandas as pd
+
+from utils.config import CONFIG, REGIONS
+from utils.quantile_sketch import QuantileSketch
+from utils.store import load_merged
+
+STATS_DIR = "data/stats"
+
+# full quantile table written to the sidecar (p1 .. p99)
+TABLE_PERCENTILES = list(range(1, 100))
+
+# smaller table for the per-month and per-hour breakdowns
+BREAKDOWN_PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def stats_path(region):
+    return os.path.join(STATS_DIR, f"{region.lower()}_demand_stats.json")
+
+
+def _table(sketch, percentiles):
+    values = sketch.quantiles([p / 100 for p in percentiles])
+    return {f"p{p}": round(v, 3) for p, v in zip(percentiles, values)}
+
+
+def _empty_state():
+    return {
+        "month": {m: QuantileSketch() for m in range(1, 13)},
+        "hour": {h: QuantileSketch() for h in range(24)},
+        "rows": 0,
+        "last_timestamp": None,
+    }
+
+
+def _add_rows(state, df):
+    # each row lands in exactly one month sketch and one hour sketch, the
+    # overall distribution is the merge of the twelve month sketches
+    ts = df["timestamp"]
+    for m, part in df["demand_mw"].groupby(ts.dt.month):
+        state["month"][int(m)].add(part.to_numpy())
+    for h, part in df["demand_mw"].groupby(ts.dt.hour):
+        state["hour"][int(h)].add(part.to_numpy())
+
+    state["rows"] += len(df)
+    last = ts.max()
+    if state["last_timestamp"] is None or last > state["last_timestamp"]:
+        state["last_timestamp"] = last
+
+
+def _overall(state):
+    overall = QuantileSketch()
+    for sketch in state["month"].values():
+        overall.merge(sketch)
+    return overall
+
+
+def _to_json(region, state):
+    overall = _overall(state)
+    return {
+        "region": region,
+        "source": CONFIG[region]["data"],
+        "rows": state["rows"],
+        "last_timestamp": str(state["last_timestamp"]),
+        "min": overall.min,
+        "max": overall.max,
+        "quantiles": _table(overall, TABLE_PERCENTILES),
+        "by_month": {
+            str(m): _table(s, BREAKDOWN_PERCENTILES)
+            for m, s in state["month"].items() if s.count
+        },
+        "by_hour": {
+            str(h): _table(s, BREAKDOWN_PERCENTILES)
+            for h, s in state["hour"].items() if s.count
+        },
+        "sketches": {
+            "month": {str(m): s.to_dict() for m, s in state["month"].items()},
+            "hour": {str(h): s.to_dict() for h, s in state["hour"].items()},
+        },
+    }
+
+
+def _from_json(stats):
+    sketches = stats["sketches"]
+    return {
+        "month": {int(m): QuantileSketch.from_dict(d) for m, d in sketches["month"].items()},
+        "hour": {int(h): QuantileSketch.from_dict(d) for h, d in sketches["hour"].items()},
+        "rows": stats["rows"],
+        "last_timestamp": pd.Timestamp(stats["last_timestamp"]),
+    }
+
+
+def _write(region, state):
+    os.makedirs(STATS_DIR, exist_ok=True)
+    path = stats_path(region)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(_to_json(region, state), f)
+    os.replace(tmp, path)
+    return path
+
+
+def build_demand_stats(region):
+    """Scan the merged history once and write the region's sidecar."""
+    df = load_merged(region, columns=["demand_mw"])
+    state = _empty_state()
+    _add_rows(state, df.dropna(subset=["demand_mw"]))
+    return _write(region, state)
+
+
+def update_demand_stats(region, new_rows):
+    """Fold new hourly rows into an existing sidecar without rescanning history.
+
+    Rows at or before the sidecar's last timestamp are ignored so the same
+    hour is never counted twice.
+    """
+    path = stats_path(region)
+    if not os.path.exists(path):
+        return build_demand_stats(region)
+
+    with open(path) as f:
+        state = _from_json(json.load(f))
+
+    new_rows = new_rows.dropna(subset=["demand_mw"])
+    new_rows = new_rows[new_rows["timestamp"] > state["last_timestamp"]]
+    if not new_rows.empty:
+        _add_rows(state, new_rows)
+        _write(region, state)
+    return path
+
+
+def load_demand_stats(region):
+    """Read the sidecar, building it from the merged CSV if it is missing."""
+    path = stats_path(region)
+    if not os.path.exists(path):
+        build_demand_stats(region)
+    with open(path) as f:
+        stats = json.load(f)
+    # the sketches are only needed for updates
+    stats.pop("sketches", None)
+    return stats
+
+
+if __name__ == "__main__":
+    import sys
+
+    # optional region names on the command line, all regions by default
+    for region in sys.argv[1:] or REGIONS:
+        path = build_demand_stats(region)
+        stats = load_demand_stats(region)
+        q = stats["quantiles"]
+        print(f"✅ {region} demand stats saved to {path}")
+        print(f"p10: {q['p10']:,.0f} | p25: {q['p25']:,.0f} | p75: {q['p75']:,.0f} | p90: {q['p90']:,.0f} MW")
@@ -0,0 +1,148 @@
+# utils/feature_cache.py
+
+import glob
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.config import CONFIG, feature_columns, model_path
+from utils import store
+from utils.csv_append import read_tail
+from utils.metrics import CACHE_REQUESTS
+from utils.preprocess import add_time_features
+
+CACHE_DIR = os.environ.get("GRIDGUARD_CACHE_DIR", "cache/features")
+
+# train/test split used by the training scripts
+TRAIN_FRACTION = 0.8
+
+# (path, size, mtime_ns) -> sha256, so big model files are hashed once per change
+_DIGESTS = {}
+
+
+def file_digest(path):
+    st = os.stat(path)
+    stamp = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _DIGESTS.get(stamp)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        _DIGESTS[stamp] = digest
+    return digest
+
+
+def cache_key(region, horizon, model_file=None):
+    dataset = store.merged_dataset(region)
+    if store.exists(dataset):
+        data_hash = store.version(dataset)[:12]
+    else:
+        data_hash = file_digest(CONFIG[region]["data"])[:12]
+    # model_file is the artifact actually served, e.g. a multi-horizon model
+    model_hash = file_digest(model_file or model_path(region, horizon))[:12]
+    return f"{region.lower()}_{horizon}h_{data_hash}_{model_hash}"
+
+
+def _frame_arrays(df, region, horizon, model_fn, after=None):
+    features = feature_columns(region)
+    df = add_time_features(df)
+    df["target"] = df["demand_mw"].shift(-horizon)
+    df = df.dropna()
+    if after is not None:
+        df = df[df["timestamp"] > after]
+
+    X = df[features]
+    arrays = {
+        "timestamp": df["timestamp"].to_numpy("datetime64[ns]").astype("int64"),
+        "target": df["target"].to_numpy("float64"),
+        "pred": model_fn().predict(X).astype("float64") if len(X) else np.empty(0),
+    }
+    for col in features:
+        arrays[f"x_{col}"] = X[col].to_numpy("float64")
+    return arrays
+
+
+def build_validation_arrays(region, horizon, model):
+    """Features, shifted target and model predictions for every usable row."""
+    df = store.load_merged(region)
+    arrays = _frame_arrays(df, region, horizon, lambda: model)
+    arrays["split"] = np.array(int(len(arrays["target"]) * TRAIN_FRACTION))
+    return arrays
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.npz")
+
+
+def load_validation_arrays(region, horizon, model_fn, key=None):
+    """Return cached validation arrays, rebuilding them if the CSV or model changed.
+
+    model_fn is only called on a cache miss, so a warm cache never touches
+    the model artifact.
+    """
+    if key is None:
+        key = cache_key(region, horizon)
+    path = _cache_path(key)
+
+    if os.path.exists(path):
+        CACHE_REQUESTS.inc(cache="validation_arrays", result="hit")
+        with np.load(path) as npz:
+            return {name: npz[name] for name in npz.files}
+
+    CACHE_REQUESTS.inc(cache="validation_arrays", result="miss")
+    arrays = build_validation_arrays(region, horizon, model_fn())
+    _save(region, horizon, key, arrays)
+    return arrays
+
+
+def _save(region, horizon, key, arrays):
+    path = _cache_path(key)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = os.path.join(CACHE_DIR, f".tmp-{os.getpid()}-{key}.npz")
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+
+    # drop entries built from older versions of the data or model
+    for stale in glob.glob(os.path.join(CACHE_DIR, f"{region.lower()}_{horizon}h_*.npz")):
+        if stale != path:
+            os.remove(stale)
+
+
+def extend_validation_arrays(region, horizon, old_key, model_fn, model_file=None):
+    """Carry the entry for old_key over to rows appended to the CSV since.
+
+    Only the rows after the entry's last timestamp (plus the horizon of
+    lookahead their targets need) are read, featurized and predicted, so
+    the cost follows the appended rows rather than the history. The
+    train/test split index is kept, the model never saw the new rows.
+    Returns False when there is no entry to extend.
+    """
+    old_path = _cache_path(old_key)
+    if not os.path.exists(old_path):
+        return False
+    with np.load(old_path) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+    last = pd.Timestamp(arrays["timestamp"][-1])
+
+    if store.exists(store.merged_dataset(region)):
+        tail = store.load_merged(region, start=last + pd.Timedelta(1, "ns"))
+    else:
+        # grow the CSV tail until it reaches back to the cached rows
+        n_rows = 256
+        while True:
+            tail = read_tail(CONFIG[region]["data"], n_rows)
+            if len(tail) < n_rows or tail["timestamp"].iloc[0] <= last:
+                break
+            n_rows *= 2
+
+    new = _frame_arrays(tail, region, horizon, model_fn, after=last)
+    for name, values in new.items():
+        arrays[name] = np.concatenate([arrays[name], values])
+
+    _save(region, horizon, cache_key(region, horizon, model_file), arrays)
+    return True
+
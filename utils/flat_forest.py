@@ -0,0 +1,270 @@
+# utils/flat_forest.py
+
+import json
+import os
+
+import numpy as np
+
+from utils.config import HORIZONS, MULTI, REGIONS, model_path
+
+# node arrays shared by every tree in the forest, one .npy file each
+NODE_ARRAYS = ("feature", "threshold", "children", "value", "roots")
+
+FORMAT_VERSION = 2
+
+TREE_LEAF = -1
+
+# (row, tree) pairs walked together per chunk on the many-row path
+BATCH_NODES = 1 << 20
+
+# storage dtypes for (threshold, value); "exact" keeps sklearn's own dtypes, so
+# every tree lands on the same leaf and predictions match sklearn to float
+# rounding (the trees' leaf values may be summed in a different order)
+PRECISIONS = {
+    "exact": ("float32", "float64"),
+    "float32": ("float32", "float32"),
+    "float16": ("float16", "float16"),
+}
+
+
+def flat_model_path(region, horizon):
+    return model_path(region, horizon).replace("models/", "models/flat/", 1)[: -len(".pkl")]
+
+
+def round_down(values, dtype):
+    """Largest value of `dtype` that is <= each float64 value.
+
+    Features are float32, so with a float32 dtype `x <= t` and
+    `x <= round_down(t)` always agree. This halves the threshold array
+    without changing any decision. Narrower dtypes do move some splits.
+    """
+    out = values.astype(dtype)
+    over = out.astype("float64") > values
+    out[over] = np.nextafter(out[over], np.array(-np.inf, dtype=dtype))
+    return out
+
+
+def _bfs_nodes(tree, max_depth=None):
+    # node ids in breadth-first order, stopping after max_depth levels
+    left, right = tree.children_left, tree.children_right
+    levels = []
+    frontier = np.array([0])
+    depth = 0
+    while frontier.size:
+        levels.append(frontier)
+        if max_depth is not None and depth == max_depth:
+            break
+        inner = frontier[left[frontier] != TREE_LEAF]
+        frontier = np.stack([left[inner], right[inner]], axis=1).ravel()
+        depth += 1
+    return np.concatenate(levels), len(levels) - 1
+
+
+def flatten_forest(model, n_trees=None, max_depth=None, precision="exact"):
+    """Concatenate the trees of a fitted forest into flat node arrays.
+
+    Child indices are rewritten to point into the combined arrays, so one
+    set of arrays describes the whole ensemble and `roots` gives the first
+    node of each tree. Leaves point back at themselves with an infinite
+    threshold, which lets traversal run a fixed number of steps with no
+    per-step bookkeeping of which rows have finished.
+
+    n_trees keeps only the first trees of the forest and max_depth turns
+    every node at that depth into a leaf holding its own mean (sklearn keeps
+    a value for internal nodes too). With the defaults nothing is dropped.
+    """
+    threshold_dtype, value_dtype = PRECISIONS[precision]
+    trees = [est.tree_ for est in model.estimators_[:n_trees]]
+
+    parts = {name: [] for name in NODE_ARRAYS}
+    offset = 0
+    depth_reached = 0
+    for t in trees:
+        old, depth = _bfs_nodes(t, max_depth)
+        depth_reached = max(depth_reached, depth)
+
+        new_index = np.full(t.node_count, TREE_LEAF, dtype="int64")
+        new_index[old] = np.arange(len(old)) + offset
+
+        left = t.children_left[old]
+        right = t.children_right[old]
+        # a node is a leaf if it was one, or its children were cut off
+        is_leaf = (left == TREE_LEAF) | (new_index[np.where(left == TREE_LEAF, 0, left)] == TREE_LEAF)
+        own = new_index[old]
+
+        children = np.empty((len(old), 2), dtype="int32")
+        children[:, 0] = np.where(is_leaf, own, new_index[np.where(is_leaf, 0, left)])
+        children[:, 1] = np.where(is_leaf, own, new_index[np.where(is_leaf, 0, right)])
+
+        parts["children"].append(children)
+        parts["feature"].append(np.where(is_leaf, 0, t.feature[old]).astype("int32"))
+        parts["threshold"].append(
+            np.where(is_leaf, np.inf, round_down(t.threshold[old], threshold_dtype)).astype(threshold_dtype)
+        )
+        # (n_nodes, n_outputs), a single-output regressor keeps one column
+        parts["value"].append(t.value[old, :, 0].astype(value_dtype))
+        parts["roots"].append(offset)
+        offset += len(old)
+
+    arrays = {
+        name: np.concatenate(chunks) if name != "roots" else np.array(chunks, dtype="int64")
+        for name, chunks in parts.items()
+    }
+
+    names = getattr(model, "feature_names_in_", None)
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "n_trees": len(trees),
+        "n_nodes": offset,
+        "max_depth": depth_reached,
+        "precision": precision,
+        "n_features": int(model.n_features_in_),
+        "n_outputs": int(arrays["value"].shape[1]),
+        # output order of a multi-horizon model
+        "horizons": getattr(model, "horizons_", None),
+        "feature_names": None if names is None else [str(n) for n in names],
+    }
+    return arrays, meta
+
+
+def export_flat(model, out_dir):
+    arrays, meta = flatten_forest(model)
+    return write_flat(arrays, meta, out_dir)
+
+
+def write_flat(arrays, meta, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for name in NODE_ARRAYS:
+        # plain .npy (not .npz) so every array can be memory-mapped
+        np.save(os.path.join(out_dir, f"{name}.npy"), np.ascontiguousarray(arrays[name]))
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return out_dir
+
+
+class FlatForest:
+    """Read-only forest backed by flat (optionally memory-mapped) node arrays.
+
+    With mmap the arrays live in the OS page cache, so every process that
+    loads the same export shares one physical copy and loading costs only a
+    few file opens.
+
+    Prediction walks the node arrays directly with NumPy, with a separate
+    path for a single row (all trees in lockstep) and for many rows (all
+    tree/row pairs in lockstep). It skips sklearn's input validation and
+    joblib dispatch, which dominate the cost of small batches.
+    """
+
+    def __init__(self, arrays, meta, mmapped=False):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.children = arrays["children"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.meta = meta
+        self.mmapped = mmapped
+        self.n_features_in_ = meta["n_features"]
+        if meta["feature_names"] is not None:
+            self.feature_names_in_ = np.array(meta["feature_names"], dtype=object)
+        if meta.get("horizons") is not None:
+            self.horizons_ = meta["horizons"]
+
+        # children as one flat array, so a step is children[2 * node + go_right]
+        self._next = self.children.reshape(-1)
+        self._roots = np.asarray(self.roots, dtype="int32")
+        self._depth = meta["max_depth"]
+
+    @classmethod
+    def from_model(cls, model):
+        """Compile a fitted sklearn forest in memory (no export needed)."""
+        arrays, meta = flatten_forest(model)
+        return cls(arrays, meta)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in NODE_ARRAYS)
+
+    @property
+    def resident_nbytes(self):
+        # mapped pages belong to the page cache, not to this process
+        return 0 if self.mmapped else self.nbytes
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns") and self.meta["feature_names"] is not None:
+            X = X[self.meta["feature_names"]]
+        return np.ascontiguousarray(np.asarray(X, dtype="float32"))
+
+    def predict(self, X):
+        """Mean prediction over all trees, same contract as sklearn's predict."""
+        X = self._as_matrix(X)
+        if X.shape[0] == 1:
+            out = self._walk_one(X[0])[None]
+        else:
+            out = self._walk_batch(X)
+        return out[:, 0] if out.shape[1] == 1 else out
+
+    def predict_one(self, x):
+        """Prediction for a single feature vector, already in column order."""
+        out = self._walk_one(np.asarray(x, dtype="float32"))
+        return out[0] if out.shape[0] == 1 else out
+
+    def _walk_one(self, x):
+        # single-row fast path: every tree advances one level per step
+        node = self._roots
+        for _ in range(self._depth):
+            go_right = x[self.feature[node]] > self.threshold[node]
+            node = self._next[2 * node + go_right]
+        return self.value[node].sum(axis=0, dtype="float64") / len(node)
+
+    def _walk_batch(self, X):
+        # many-row path: every (tree, row) pair advances one level per step,
+        # in chunks of about BATCH_NODES pairs so memory stays bounded
+        n, n_features = X.shape
+        n_trees = len(self._roots)
+        out = np.empty((n, self.value.shape[1]), dtype="float64")
+
+        flat_x = X.reshape(-1)
+        chunk = max(1, BATCH_NODES // n_trees)
+        for start in range(0, n, chunk):
+            m = min(chunk, n - start)
+            # tree-major order keeps each step's node reads inside one tree
+            node = np.repeat(self._roots, m)
+            base = np.tile(np.arange(start, start + m, dtype="int32") * n_features, n_trees)
+
+            for _ in range(self._depth):
+                go_right = flat_x[base + self.feature[node]] > self.threshold[node]
+                node = self._next[2 * node + go_right]
+
+            leaves = self.value[node].reshape(n_trees, m, -1)
+            out[start:start + m] = leaves.sum(axis=0, dtype="float64") / n_trees
+
+        return out
+
+
+def load_flat(path, mmap=True):
+    mode = "r" if mmap else None
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+        for name in NODE_ARRAYS
+    }
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{path} was exported in an older format, re-run python -m utils.flat_forest")
+    return FlatForest(arrays, meta, mmapped=mmap)
+
+
+if __name__ == "__main__":
+    import joblib
+
+    for region in REGIONS:
+        for horizon in HORIZONS + [MULTI]:
+            if horizon == MULTI and not os.path.exists(model_path(region, MULTI)):
+                continue
+            model = joblib.load(model_path(region, horizon))
+            out_dir = export_flat(model, flat_model_path(region, horizon))
+            size_mb = sum(
+                os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir)
+            ) / (1024 * 1024)
+            label = "multi-horizon" if horizon == MULTI else f"{horizon}h"
+            print(f"✅ {region} {label} exported to {out_dir} ({size_mb:,.1f} MB)")
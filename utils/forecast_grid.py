@@ -0,0 +1,102 @@
+# utils/forecast_grid.py
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.config import HORIZONS, REGIONS, feature_columns
+from utils.metrics import timed_predict
+from utils.preprocess import TIME_COLUMNS, forecast_timestamp, time_features
+from utils.risk import classify_risk
+
+def input_problem(demand_mw, temp_c):
+    """Why a (demand, temperature) pair can't be forecast, None if it can."""
+    try:
+        demand, temp = float(demand_mw), float(temp_c)
+    except (TypeError, ValueError):
+        return "demand_mw and temp_c must be numbers"
+    if not math.isfinite(demand) or demand <= 0:
+        return f"demand_mw must be a positive number, got {demand_mw!r}"
+    if not math.isfinite(temp):
+        return f"temp_c must be a finite number, got {temp_c!r}"
+    return None
+
+
+def build_feature_block(inputs, month, day, hour, regions=REGIONS, year=None):
+    """One feature row per region as a single (n_regions, 8) array.
+
+    inputs maps region -> (demand_mw, temp_c), which fill columns 0 and 1
+    (temperature sits in column 1 for every region, only its name differs).
+    The time features are the same for every region, so they are computed
+    once into the first row and broadcast.
+    """
+    ts = forecast_timestamp(month, day, hour, year)
+
+    X = np.empty((len(regions), 2 + len(TIME_COLUMNS)), dtype="float64")
+    time_features(np.array([ts.value], dtype="int64"), out=X[:1, 2:])
+    X[1:, 2:] = X[0, 2:]
+    for i, region in enumerate(regions):
+        X[i, 0], X[i, 1] = inputs[region]
+    return X
+
+
+def predict_grid(registry, X, regions=REGIONS, horizons=HORIZONS, max_workers=None):
+    """Predict every (region, horizon) pair, one model per task.
+
+    A region served by a multi-horizon model is a single task that fills
+    its whole row with one predict call. Tree prediction releases the GIL,
+    so the models run concurrently in a thread pool. Returns an
+    (n_regions, n_horizons) array.
+    """
+    frames = [
+        pd.DataFrame(X[i:i + 1], columns=feature_columns(region))
+        for i, region in enumerate(regions)
+    ]
+
+    def run(i, j):
+        model = registry.get(regions[i], horizons[j])
+        return i, [j], timed_predict(model, frames[i], "forecast_grid")[:1]
+
+    def run_multi(i, model):
+        cols = [list(model.horizons_).index(h) for h in horizons]
+        pred = timed_predict(model, frames[i], "forecast_grid")
+        return i, list(range(len(horizons))), np.asarray(pred)[0, cols]
+
+    if max_workers is None:
+        max_workers = min(len(regions) * len(horizons), os.cpu_count() or 1)
+
+    out = np.empty((len(regions), len(horizons)), dtype="float64")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        tasks = []
+        for i, region in enumerate(regions):
+            multi = registry.horizon_model(region)
+            if multi is not None:
+                tasks.append(pool.submit(run_multi, i, multi))
+            else:
+                tasks.extend(pool.submit(run, i, j) for j in range(len(horizons)))
+        for task in tasks:
+            i, cols, values = task.result()
+            out[i, cols] = values
+    return out
+
+
+def grid_table(predictions, inputs, percentiles, regions=REGIONS, horizons=HORIZONS):
+    """Long-format table (one row per region and horizon) with risk levels."""
+    rows = []
+    for i, region in enumerate(regions):
+        demand = inputs[region][0]
+        for j, horizon in enumerate(horizons):
+            prediction = predictions[i, j]
+            risk, reason = classify_risk(prediction, percentiles[region])
+            rows.append({
+                "region": region,
+                "horizon": f"+{horizon}h",
+                "forecast_mw": prediction,
+                "change_pct": (prediction - demand) / demand * 100 if demand else np.nan,
+                "risk": risk,
+                "reason": reason,
+            })
+    return pd.DataFrame(rows)
@@ -0,0 +1,321 @@
+# utils/metrics.py
+
+# process-wide counters and histograms for the hot paths (page phases,
+# cache hits and misses, model loads, predict calls), rendered in the
+# Prometheus text format. Nothing leaves the process unless an exporter is
+# switched on:
+#
+#     GRIDGUARD_METRICS_PORT=9108     serve /metrics from a background thread
+#     GRIDGUARD_METRICS_FILE=path     write a snapshot every
+#                                     GRIDGUARD_METRICS_INTERVAL seconds,
+#                                     rotating the file at
+#                                     GRIDGUARD_METRICS_MAX_MB
+#
+# SamplingProfiler records one thread's stacks in the folded format that
+# flamegraph.pl and speedscope read.
+
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter as _Tally
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROWS_BUCKETS = (1, 8, 64, 512, 4096, 32768)
+
+DEFAULT_INTERVAL_S = 15
+DEFAULT_MAX_MB = 10
+BACKUPS = 3
+
+PROFILE_DIR = "profiles"
+PROFILE_INTERVAL_S = 0.005
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _value(v):
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.type = "counter"
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Histogram:
+    def __init__(self, name, help, buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.help = help
+        self.type = "histogram"
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        out = []
+        with self._lock:
+            for key, series in self._series.items():
+                # Prometheus buckets are cumulative
+                running = 0
+                for bound, n in zip(self.buckets, series["counts"]):
+                    running += n
+                    out.append((f"{self.name}_bucket", key + (("le", f"{bound:g}"),), running))
+                out.append((f"{self.name}_bucket", key + (("le", "+Inf"),), series["count"]))
+                out.append((f"{self.name}_sum", key, series["sum"]))
+                out.append((f"{self.name}_count", key, series["count"]))
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, cls, name, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            return metric
+
+    def counter(self, name, help):
+        return self._add(Counter, name, help)
+
+    def histogram(self, name, help, buckets=SECONDS_BUCKETS):
+        return self._add(Histogram, name, help, buckets)
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_labels(key)} {_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+PHASE_SECONDS = REGISTRY.histogram("gridguard_phase_seconds", "Time per app phase (data, model load, predict, chart, ...)")
+RERUN_SECONDS = REGISTRY.histogram("gridguard_rerun_seconds", "Whole script run time per page")
+CACHE_REQUESTS = REGISTRY.counter("gridguard_cache_requests_total", "Cache lookups by cache and hit/miss")
+MODEL_LOAD_SECONDS = REGISTRY.histogram("gridguard_model_load_seconds", "Model artifact load time")
+MODEL_LOAD_BYTES = REGISTRY.counter("gridguard_model_load_bytes_total", "Resident bytes of loaded models")
+PREDICT_SECONDS = REGISTRY.histogram("gridguard_predict_seconds", "predict() latency by caller")
+PREDICT_ROWS = REGISTRY.histogram("gridguard_predict_rows", "Rows per predict() call by caller", ROWS_BUCKETS)
+
+
+def timed_predict(model, X, path):
+    """model.predict(X), recording its latency and batch size under `path`."""
+    start = time.perf_counter()
+    pred = model.predict(X)
+    PREDICT_SECONDS.observe(time.perf_counter() - start, path=path)
+    PREDICT_ROWS.observe(len(X), path=path)
+    return pred
+
+
+def record_phases(page, phases, total):
+    for name, seconds in phases:
+        PHASE_SECONDS.observe(seconds, page=page, phase=name)
+    RERUN_SECONDS.observe(total, page=page)
+
+
+def track_cache(name, cache_decorator):
+    """Apply a caching decorator (st.cache_data(...), ...) and count its hits and misses.
+
+    The wrapped function only runs on a miss, so it flags the call it is
+    part of; the outer wrapper reads the flag once the lookup returns.
+    """
+    state = threading.local()
+
+    def wrap(fn):
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            state.miss = True
+            return fn(*args, **kwargs)
+
+        cached = cache_decorator(compute)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            state.miss = False
+            result = cached(*args, **kwargs)
+            CACHE_REQUESTS.inc(cache=name, result="miss" if state.miss else "hit")
+            return result
+
+        call.clear = getattr(cached, "clear", None)
+        return call
+
+    return wrap
+
+
+# -------------------------------------------------
+# Exporters
+# -------------------------------------------------
+def serve(port, host="127.0.0.1", registry=REGISTRY):
+    """Serve GET /metrics from a daemon thread; returns the server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            payload = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_snapshot(path, max_bytes, registry=REGISTRY, backups=BACKUPS):
+    """Append a timestamped snapshot to path, rotating path -> path.1 -> ... at max_bytes."""
+    if os.path.exists(path) and os.path.getsize(path) >= max_bytes:
+        for i in range(backups - 1, 0, -1):
+            if os.path.exists(f"{path}.{i}"):
+                os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+        os.replace(path, f"{path}.1")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(f"# snapshot {time.strftime('%Y-%m-%dT%H:%M:%S')}\n")
+        f.write(registry.render())
+
+
+def _write_forever(path, interval, max_bytes):
+    while True:
+        time.sleep(interval)
+        write_snapshot(path, max_bytes)
+
+
+_STARTED = False
+_START_LOCK = threading.Lock()
+
+
+def start_exporters():
+    """Start the exporters switched on in the environment, once per process."""
+    global _STARTED
+    with _START_LOCK:
+        if _STARTED:
+            return
+        _STARTED = True
+
+    port = os.environ.get("GRIDGUARD_METRICS_PORT")
+    if port:
+        try:
+            serve(int(port))
+        except OSError as exc:
+            # e.g. a second app process on the same port; run without the endpoint
+            print(f"⚠️ Metrics endpoint not started on port {port}: {exc}", file=sys.stderr)
+
+    path = os.environ.get("GRIDGUARD_METRICS_FILE")
+    if path:
+        interval = float(os.environ.get("GRIDGUARD_METRICS_INTERVAL", DEFAULT_INTERVAL_S))
+        max_bytes = int(float(os.environ.get("GRIDGUARD_METRICS_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        threading.Thread(
+            target=_write_forever, args=(path, interval, max_bytes), name="metrics-file", daemon=True
+        ).start()
+
+
+# -------------------------------------------------
+# Sampling profiler
+# -------------------------------------------------
+class SamplingProfiler:
+    """Sample one thread's Python stack every `interval` seconds.
+
+    Samples are tallied as folded stacks ("outer;inner;leaf count"), so
+    the cost is a dict update per sample and nothing is traced in between.
+    """
+
+    def __init__(self, thread_id=None, interval=PROFILE_INTERVAL_S):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = _Tally()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
@@ -0,0 +1,207 @@
+# utils/model_registry.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.config import MULTI, model_path
+from utils.flat_forest import FlatForest, flat_model_path, load_flat
+from utils.metrics import CACHE_REQUESTS, MODEL_LOAD_BYTES, MODEL_LOAD_SECONDS
+
+# default RAM budget for resident models, override with GRIDGUARD_MODEL_BUDGET_MB
+DEFAULT_BUDGET_MB = 1536
+
+# "pickle" unpickles models/*.pkl into every process, "flat" memory-maps the
+# exports under models/flat so all worker processes share one copy and
+# "compiled" unpickles once then keeps only the flat-array engine
+DEFAULT_FORMAT = "pickle"
+MODEL_FORMATS = ("pickle", "flat", "compiled")
+
+# GRIDGUARD_MULTI_HORIZON=1 serves every horizon of a region from its single
+# multi-output model (models/<region>_model_multi.pkl) when one exists
+DEFAULT_MULTI_HORIZON = "0"
+
+
+def estimate_nbytes(model, path=None):
+    """Approximate resident size of a fitted model in bytes."""
+    resident = getattr(model, "resident_nbytes", None)
+    if resident is not None:
+        return resident
+
+    estimators = getattr(model, "estimators_", None)
+    if estimators is not None:
+        total = 0
+        for est in estimators:
+            state = est.tree_.__getstate__()
+            total += state["nodes"].nbytes + state["values"].nbytes
+        return total
+
+    # not a tree ensemble, the pickle size is the best guess we have
+    if path is not None and os.path.exists(path):
+        return os.path.getsize(path)
+    return 0
+
+
+class HorizonView:
+    """One horizon's output of a multi-horizon model, behind the usual predict()."""
+
+    def __init__(self, model, horizon):
+        self.model = model
+        self.horizon = horizon
+        self.index = list(model.horizons_).index(horizon)
+
+    def predict(self, X):
+        return np.asarray(self.model.predict(X))[:, self.index]
+
+
+class ModelRegistry:
+    """Process-wide cache of fitted models keyed by (region, horizon).
+
+    Each artifact is unpickled once and shared by every caller. When the
+    resident total goes over the RAM budget the least recently used models
+    are dropped until it fits again (the model just requested is never
+    dropped, even if it alone is over budget).
+    """
+
+    def __init__(self, budget_mb=None, model_format=None, multi_horizon=None, lags=False):
+        if budget_mb is None:
+            budget_mb = float(os.environ.get("GRIDGUARD_MODEL_BUDGET_MB", DEFAULT_BUDGET_MB))
+        if model_format is None:
+            model_format = os.environ.get("GRIDGUARD_MODEL_FORMAT", DEFAULT_FORMAT)
+        if model_format not in MODEL_FORMATS:
+            raise ValueError(
+                f"Unknown model format {model_format!r} (GRIDGUARD_MODEL_FORMAT), expected one of: {', '.join(MODEL_FORMATS)}"
+            )
+        if multi_horizon is None:
+            multi_horizon = os.environ.get("GRIDGUARD_MULTI_HORIZON", DEFAULT_MULTI_HORIZON) == "1"
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.model_format = model_format
+        self.multi_horizon = multi_horizon
+        # serve the lag-feature models (models/<region>_model_<h>h_lags.pkl)
+        self.lags = lags
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def uses_multi(self, region):
+        return self.multi_horizon and os.path.exists(model_path(region, MULTI, self.lags))
+
+    def artifact_path(self, region, horizon):
+        """The pickle a (region, horizon) forecast is served from."""
+        return model_path(region, MULTI if self.uses_multi(region) else horizon, self.lags)
+
+    def horizon_model(self, region):
+        """The region's multi-horizon model, None when serving per-horizon models."""
+        return self._get(region, MULTI) if self.uses_multi(region) else None
+
+    def get(self, region, horizon):
+        if horizon != MULTI and self.uses_multi(region):
+            return HorizonView(self._get(region, MULTI), horizon)
+        return self._get(region, horizon)
+
+    def _get(self, region, horizon):
+        key = (region, horizon)
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                entry["last_used"] = time.time()
+                self.hits += 1
+                CACHE_REQUESTS.inc(cache="models", result="hit")
+                return entry["model"]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # load outside the registry lock so other sessions are not blocked,
+        # but never unpickle the same artifact twice at the same time
+        with key_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    CACHE_REQUESTS.inc(cache="models", result="hit")
+                    return entry["model"]
+
+            start = time.perf_counter()
+            model, path = self._load(region, horizon)
+            load_seconds = time.perf_counter() - start
+
+            entry = {
+                "model": model,
+                "path": path,
+                "nbytes": estimate_nbytes(model, path),
+                "load_seconds": load_seconds,
+                "last_used": time.time(),
+            }
+
+            with self._lock:
+                self.misses += 1
+                self._models[key] = entry
+                self._evict(keep=key)
+            CACHE_REQUESTS.inc(cache="models", result="miss")
+            MODEL_LOAD_SECONDS.observe(load_seconds, format=self.model_format)
+            MODEL_LOAD_BYTES.inc(entry["nbytes"], format=self.model_format)
+
+        return model
+
+    def _load(self, region, horizon):
+        if self.model_format == "flat" and not self.lags:
+            path = flat_model_path(region, horizon)
+            if os.path.isdir(path):
+                return load_flat(path, mmap=True), path
+        # no flat export yet, fall back to the pickle
+        # joblib (and sklearn, through unpickling) only load on first use
+        import joblib
+
+        path = model_path(region, horizon, self.lags)
+        model = joblib.load(path)
+        if self.model_format in ("flat", "compiled"):
+            model = FlatForest.from_model(model)
+        return model, path
+
+    def _evict(self, keep):
+        while self.resident_bytes() > self.budget_bytes and len(self._models) > 1:
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                self._models.move_to_end(oldest)
+                continue
+            del self._models[oldest]
+            self.evictions += 1
+
+    def resident_bytes(self):
+        return sum(e["nbytes"] for e in self._models.values())
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def stats(self):
+        """One row per resident model, most recently used last."""
+        with self._lock:
+            return [
+                {
+                    "region": region,
+                    "horizon": horizon,
+                    "size_mb": entry["nbytes"] / (1024 * 1024),
+                    "load_s": entry["load_seconds"],
+                }
+                for (region, horizon), entry in self._models.items()
+            ]
+
+    def summary(self):
+        with self._lock:
+            return {
+                "resident_mb": self.resident_bytes() / (1024 * 1024),
+                "budget_mb": self.budget_bytes / (1024 * 1024),
+                "models": len(self._models),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,112 @@
+# utils/noaa_isd.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# ISD global-hourly CSV exports, see the ISD format document for TMP:
+# "+0056,1" is a sign, four digits in tenths of a degree C, a comma and a
+# one character quality code
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+TMP_WIDTH = 7
+TMP_MISSING = 9999
+
+# quality codes that passed NOAA's checks (2, 3, 6 and 7 are suspect or
+# erroneous readings)
+QUALITY_OK = b"01459ACIMPRU"
+
+# readings outside this range are instrument or transcription errors
+TEMP_RANGE_C = (-50, 60)
+
+CHUNK_ROWS = 200_000
+
+
+def decode_tmp(values):
+    """TMP strings to degrees C, NaN where missing, malformed or flagged.
+
+    Works on the raw bytes of a fixed-width array instead of splitting
+    strings, so a chunk decodes in a handful of numpy operations.
+    """
+    # one spare byte so longer, malformed values can be detected
+    raw = np.asarray(pd.Series(values).fillna("").to_numpy(dtype=f"S{TMP_WIDTH + 1}"))
+    b = raw.view(np.uint8).reshape(len(raw), TMP_WIDTH + 1)
+
+    digits = b[:, 1:5].astype(np.int32) - ord("0")
+    tenths = digits @ np.array([1000, 100, 10, 1], dtype=np.int32)
+    sign = np.where(b[:, 0] == ord("-"), -1, 1)
+
+    valid = (
+        ((b[:, 0] == ord("+")) | (b[:, 0] == ord("-")))
+        & ((digits >= 0) & (digits <= 9)).all(axis=1)
+        & (b[:, 5] == ord(","))
+        & np.isin(b[:, 6], np.frombuffer(QUALITY_OK, dtype=np.uint8))
+        & (b[:, TMP_WIDTH] == 0)
+        & (tenths != TMP_MISSING)
+    )
+    temp = np.where(valid, sign * tenths / 10, np.nan)
+
+    lo, hi = TEMP_RANGE_C
+    temp[(temp <= lo) | (temp >= hi)] = np.nan
+    return temp
+
+
+def _chunk_hourly(chunk):
+    # (hour since epoch, sum, count) for the valid readings of one chunk
+    ts = pd.to_datetime(chunk["DATE"], format=DATE_FORMAT, errors="coerce")
+    temp = decode_tmp(chunk["TMP"])
+    ok = ts.notna().to_numpy() & ~np.isnan(temp)
+
+    hours = ts.to_numpy()[ok].astype("datetime64[h]").astype("int64")
+    hours, inverse = np.unique(hours, return_inverse=True)
+    sums = np.bincount(inverse, weights=temp[ok], minlength=len(hours))
+    counts = np.bincount(inverse, minlength=len(hours))
+    return pd.DataFrame({"sum": sums, "count": counts}, index=hours)
+
+
+def hourly_sums(path, chunk_rows=CHUNK_ROWS):
+    """Per-hour temperature sum and reading count for one raw ISD file.
+
+    Only DATE and TMP are read, chunk by chunk. Partial results are small
+    (one row per hour) and add up exactly, so hours split across chunks or
+    files combine correctly.
+    """
+    parts = [
+        _chunk_hourly(chunk)
+        for chunk in pd.read_csv(path, usecols=["DATE", "TMP"], dtype=str, chunksize=chunk_rows)
+    ]
+    if not parts:
+        return pd.DataFrame({"sum": [], "count": []})
+    return pd.concat(parts).groupby(level=0).sum()
+
+
+def hourly_means(sums):
+    """Hourly mean temperature with one row per hour in the covered range."""
+    if sums.empty:
+        return pd.Series(dtype="float64", index=pd.DatetimeIndex([], name="timestamp"))
+    hours = np.arange(sums.index.min(), sums.index.max() + 1)
+    full = sums.reindex(hours)
+    index = pd.DatetimeIndex(hours.astype("datetime64[h]").astype("datetime64[ns]"), name="timestamp")
+    return pd.Series((full["sum"] / full["count"]).to_numpy(), index=index)
+
+
+def parse_stations(stations, max_workers=None):
+    """Hourly means for {station: [raw file, ...]}, one worker task per file.
+
+    Many stations or many yearly files per station are spread over a
+    process pool; each task only holds one chunk plus its hourly totals.
+    """
+    tasks = [(name, path) for name, paths in stations.items() for path in paths]
+    max_workers = max_workers or min(len(tasks), os.cpu_count() or 1) or 1
+
+    totals = {name: [] for name in stations}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [(name, pool.submit(hourly_sums, path)) for name, path in tasks]
+        for name, future in futures:
+            totals[name].append(future.result())
+
+    return {
+        name: hourly_means(pd.concat(parts).groupby(level=0).sum())
+        for name, parts in totals.items()
+    }
@@ -1,5 +1,47 @@
 # utils/preprocess.py
 
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from utils.config import CONFIG, LAG_HOURS, ROLLING_FEATURES, lag_columns
+
+# calendar features every model uses, in the order of feature_columns()
+TIME_COLUMNS = ["sin_hour", "cos_hour", "dayofweek", "is_weekend", "sin_doy", "cos_doy"]
+
+NS_PER_HOUR = 3_600_000_000_000
+
+# lookup tables, built once: the features only depend on the hour of the
+# year and the day of the week, so rows are gathered instead of running
+# trig over every timestamp. Values match the element-wise formulas exactly.
+_HOURS = np.arange(366 * 24)
+_DAY_OF_YEAR = _HOURS // 24 + 1
+# hour of year -> sin_hour, cos_hour, sin_doy, cos_doy
+HOUR_OF_YEAR = np.column_stack([
+    np.sin(2 * np.pi * (_HOURS % 24) / 24),
+    np.cos(2 * np.pi * (_HOURS % 24) / 24),
+    np.sin(2 * np.pi * _DAY_OF_YEAR / 365),
+    np.cos(2 * np.pi * _DAY_OF_YEAR / 365),
+])
+# day of week (Monday = 0) -> dayofweek, is_weekend
+DAY_OF_WEEK = np.column_stack([np.arange(7), np.arange(7) >= 5]).astype("float64")
+
+# both combined into whole TIME_COLUMNS rows, indexed by hour_of_year * 7 +
+# weekday, so one gather fills a contiguous output row (61,488 rows, 2.9 MB)
+CALENDAR = np.empty((len(HOUR_OF_YEAR), 7, len(TIME_COLUMNS)))
+CALENDAR[:, :, 0:2] = HOUR_OF_YEAR[:, None, 0:2]
+CALENDAR[:, :, 2:4] = DAY_OF_WEEK[None, :, :]
+CALENDAR[:, :, 4:6] = HOUR_OF_YEAR[:, None, 2:4]
+CALENDAR = CALENDAR.reshape(-1, len(TIME_COLUMNS))
+
+# day number (since the epoch) of every January 1st nanosecond timestamps can reach
+YEAR_STARTS = np.array([f"{y}-01-01" for y in range(1677, 2263)], dtype="datetime64[D]").view("int64")
+
+# 1970-01-01 was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
 def clean_input(df):
     required_cols = ["timestamp", "temperature", "demand_mw"]
     missing = [c for c in required_cols if c not in df.columns]
@@ -8,3 +50,85 @@ def clean_input(df):
         raise ValueError(f"Missing columns: {missing}")
 
     return df
+
+
+def _as_ns(timestamps):
+    values = timestamps.to_numpy() if isinstance(timestamps, (pd.Series, pd.Index)) else np.asarray(timestamps)
+    if values.dtype.kind == "M":
+        values = values.astype("datetime64[ns]")
+    return values.view("int64") if values.dtype.kind == "M" else values.astype("int64", copy=False)
+
+
+def time_features(timestamps, out=None):
+    """Calendar features for int64 nanosecond timestamps (or datetimes).
+
+    Returns an (n, 6) float64 array in TIME_COLUMNS order. Streaming callers
+    can pass `out`, any (n, 6) float64 array or column slice of a wider
+    feature block, to fill it in place instead of allocating.
+    """
+    ns = _as_ns(timestamps)
+    if out is None:
+        out = np.empty((len(ns), len(TIME_COLUMNS)), dtype="float64")
+
+    hours = ns // NS_PER_HOUR
+    days = hours // 24
+    year_start = YEAR_STARTS[np.searchsorted(YEAR_STARTS, days, side="right") - 1]
+    index = (hours - year_start * 24) * 7 + (days + _EPOCH_WEEKDAY) % 7
+
+    np.take(CALENDAR, index, axis=0, out=out, mode="clip")
+    return out
+
+
+def add_time_features(df):
+    # calendar and cyclic features used by every model
+    block = time_features(df["timestamp"])
+    for i, col in enumerate(TIME_COLUMNS):
+        df[col] = block[:, i]
+    return df
+
+
+def add_lag_features(df, region):
+    """Lag and rolling-window columns (lag_columns()) for the lag models.
+
+    Computed on the hourly clock, not row positions: a missing hour is a
+    missing value, and any window or lag that reaches one is NaN. That is
+    what utils.streaming's buffers produce one hour at a time. Timestamps
+    must be sorted; a repeated hour keeps its first row, as the stream does.
+    """
+    hours = _as_ns(df["timestamp"]) // NS_PER_HOUR
+    if len(hours) == 0:
+        for col in lag_columns():
+            df[col] = np.nan
+        return df
+    slot = hours - hours[0]
+    _, first = np.unique(slot, return_index=True)
+
+    series = {}
+    for source, col in (("demand", "demand_mw"), ("temp", CONFIG[region]["temp_col"])):
+        values = np.full(slot[-1] + 1, np.nan)
+        values[slot[first]] = df[col].to_numpy("float64")[first]
+        series[source] = values
+
+    for lag in LAG_HOURS:
+        lagged = np.full(len(series["demand"]), np.nan)
+        lagged[lag:] = series["demand"][:-lag]
+        df[f"demand_lag_{lag}h"] = lagged[slot]
+    for source, stat, window in ROLLING_FEATURES:
+        rolling = pd.Series(series[source]).rolling(window, min_periods=window)
+        df[f"{source}_{stat}_{window}h"] = getattr(rolling, stat)().to_numpy()[slot]
+    return df
+
+
+def forecast_timestamp(month, day, hour, year=None):
+    """The hour a hand-entered forecast is for; the day is clamped to the month."""
+    year = year or pd.Timestamp.now().year
+    day = min(day, calendar.monthrange(year, month)[1])
+    return pd.Timestamp(year=year, month=month, day=day, hour=hour)
+
+
+def live_time_features(month, day, hour, year=None):
+    # time features for a single hand-entered forecast (Live Forecast page,
+    # forecast grid and service), the same features the models trained on
+    ts = forecast_timestamp(month, day, hour, year)
+    row = time_features(np.array([ts.value], dtype="int64"))[0]
+    return dict(zip(TIME_COLUMNS, row.tolist()))
@@ -0,0 +1,107 @@
+# utils/quantile_sketch.py
+
+import math
+
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch with relative-error guarantees.
+
+    Values are counted in logarithmically sized buckets (the DDSketch
+    scheme), so any quantile comes back within `alpha` relative error of
+    the exact answer no matter how many values were added. Two sketches
+    with the same `alpha` merge by adding bucket counts, which is what lets
+    the demand statistics grow one hour at a time.
+    """
+
+    def __init__(self, alpha=0.005):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        values = np.asarray(values, dtype="float64").ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        self.count += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > 0]
+        self.zero_count += int(values.size - positive.size)
+
+        idx = np.ceil(np.log(positive) / self._log_gamma).astype("int64")
+        keys, counts = np.unique(idx, return_counts=True)
+        for k, c in zip(keys.tolist(), counts.tolist()):
+            self.bins[k] = self.bins.get(k, 0) + c
+        return self
+
+    def merge(self, other):
+        if other.alpha != self.alpha:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for k, c in other.bins.items():
+            self.bins[k] = self.bins.get(k, 0) + c
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantiles(self, qs):
+        """Estimate several quantiles (0..1) in one pass over the buckets."""
+        if self.count == 0:
+            return [math.nan for _ in qs]
+
+        keys = sorted(self.bins)
+        cum = np.cumsum([self.bins[k] for k in keys]) + self.zero_count
+
+        out = []
+        for q in qs:
+            if q <= 0:
+                out.append(self.min)
+                continue
+            if q >= 1:
+                out.append(self.max)
+                continue
+            rank = q * (self.count - 1)
+            if rank < self.zero_count:
+                out.append(min(0.0, self.max))
+                continue
+            i = int(np.searchsorted(cum, rank, side="right"))
+            value = 2 * self.gamma ** keys[i] / (self.gamma + 1)
+            out.append(min(max(value, self.min), self.max))
+        return out
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def to_dict(self):
+        keys = sorted(self.bins)
+        return {
+            "alpha": self.alpha,
+            "count": self.count,
+            "zero_count": self.zero_count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "keys": keys,
+            "counts": [self.bins[k] for k in keys],
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        sketch = cls(alpha=d["alpha"])
+        sketch.bins = dict(zip(d["keys"], d["counts"]))
+        sketch.zero_count = d["zero_count"]
+        sketch.count = d["count"]
+        if d["count"]:
+            sketch.min = d["min"]
+            sketch.max = d["max"]
+        return sketch
@@ -0,0 +1,19 @@
+# utils/risk.py
+
+def percentile_bands(stats):
+    # the four cut points the risk levels are built on
+    q = stats["quantiles"]
+    return {"p10": q["p10"], "p25": q["p25"], "p75": q["p75"], "p90": q["p90"]}
+
+
+def classify_risk(prediction, pcts):
+    """Two-sided grid stress risk for a forecast, returns (risk, reason)."""
+    if prediction < pcts["p10"]:
+        return "🔴 High Risk", "Forecasted demand is far below normal historical levels."
+    if prediction < pcts["p25"]:
+        return "🟡 Medium Risk", "Demand is unusually low compared to typical patterns."
+    if prediction < pcts["p75"]:
+        return "🟢 Low Risk", "Forecasted demand is within normal operating range."
+    if prediction < pcts["p90"]:
+        return "🟡 Medium Risk", "Demand is elevated compared to historical norms."
+    return "🔴 High Risk", "Forecast approaches historical peak demand levels."
@@ -0,0 +1,54 @@
+# utils/scenario_sweep.py
+
+# what-if surfaces for the Scenario Sweep page: every temperature in
+# TEMPERATURES x every hour of the selected days, with the current demand
+# held fixed, as one feature block scored by a single predict call.
+#
+# the current demand is rounded to DEMAND_BUCKET_MW before the sweep, so
+# nearby demands share one cached surface and the surface shown is exactly
+# the one for the demand it is labelled with.
+
+import numpy as np
+import pandas as pd
+
+from utils.config import feature_columns
+from utils.metrics import timed_predict
+from utils.preprocess import NS_PER_HOUR, TIME_COLUMNS, time_features
+
+TEMPERATURES = np.arange(-10.0, 46.0)
+HOURS = 24
+DEMAND_BUCKET_MW = 500
+
+MAX_DAYS = 7
+
+
+def demand_bucket(demand_mw):
+    return int(round(demand_mw / DEMAND_BUCKET_MW) * DEMAND_BUCKET_MW)
+
+
+def sweep_days(start, n_days):
+    """n_days consecutive dates from start, as ISO strings (hashable cache keys)."""
+    return tuple(str(d.date()) for d in pd.date_range(pd.Timestamp(start), periods=n_days, freq="D"))
+
+
+def build_sweep_block(region, demand_mw, days, temperatures=TEMPERATURES):
+    """Feature block of every (day, hour, temperature), in that order.
+
+    Rows are laid out so the predictions reshape to (days, 24, temperatures).
+    The time features are gathered once per row straight into the block.
+    """
+    hours = pd.DatetimeIndex(days).as_unit("ns").asi8[:, None] // NS_PER_HOUR + np.arange(HOURS)
+    ns = np.repeat(hours.ravel(), len(temperatures)) * NS_PER_HOUR
+
+    X = np.empty((len(ns), 2 + len(TIME_COLUMNS)), dtype="float64")
+    X[:, 0] = demand_mw
+    X[:, 1] = np.tile(temperatures, len(days) * HOURS)
+    time_features(ns, out=X[:, 2:])
+    return pd.DataFrame(X, columns=feature_columns(region))
+
+
+def sweep_surface(model, region, demand_mw, days, temperatures=TEMPERATURES):
+    """(days, 24, temperatures) array of forecasts from one predict call."""
+    X = build_sweep_block(region, demand_mw, days, temperatures)
+    pred = np.asarray(timed_predict(model, X, "scenario_sweep"), dtype="float64")
+    return pred.reshape(len(days), HOURS, len(temperatures))
@@ -0,0 +1,306 @@
+# utils/store.py
+
+# columnar, time-partitioned storage for the hourly datasets. Each dataset
+# (merged/austin, weather/austin, ercot/scent, ...) is a folder with one
+# partition file per calendar month plus meta.json:
+#
+#     data/store/merged/austin/2021/01.bin
+#
+# a partition holds its columns back to back as raw little-endian arrays:
+# timestamps as int64 nanoseconds, then every value column as float64, or
+# float32 for a column that already is float32, so the store hands back the
+# same values as the CSV it was built from (demand_mw is a training target,
+# rounding it would change the models). meta.json has the column order, each
+# column's dtype and each partition's row count, so readers seek straight to
+# a column with no header to parse. Readers only open partitions overlapping
+# their time range and only read the columns they ask for.
+#
+#     python -m utils.store                      (merged data for every region)
+#     python -m utils.store merged/austin=data/merged/austin_scent_merged.csv
+#     python -m utils.store --export merged/austin out.csv
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from utils import csv_append
+from utils.config import CONFIG, REGIONS
+
+STORE_DIR = os.environ.get("GRIDGUARD_STORE_DIR", "data/store")
+
+TIME_DTYPE = np.dtype("<i8")
+VALUE_DTYPE = np.dtype("<f8")
+
+
+def dataset_dir(dataset):
+    return os.path.join(STORE_DIR, *dataset.split("/"))
+
+
+def meta_path(dataset):
+    return os.path.join(dataset_dir(dataset), "meta.json")
+
+
+def exists(dataset):
+    return os.path.exists(meta_path(dataset))
+
+
+def read_meta(dataset):
+    with open(meta_path(dataset)) as f:
+        return json.load(f)
+
+
+def _write_meta(directory, meta):
+    path = os.path.join(directory, "meta.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _partition_file(directory, part):
+    return os.path.join(directory, f"{part}.bin")
+
+
+def _write_partition(directory, part, arrays, columns):
+    path = _partition_file(directory, part)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    h = hashlib.sha256()
+    with open(tmp, "wb") as f:
+        for name in ["timestamp", *columns]:
+            block = np.ascontiguousarray(arrays[name]).tobytes()
+            h.update(block)
+            f.write(block)
+    os.replace(tmp, path)
+
+    ts = arrays["timestamp"]
+    return {"rows": len(ts), "first": int(ts[0]), "last": int(ts[-1]), "sha256": h.hexdigest()}
+
+
+def _dtypes(meta):
+    # {column: dtype}; datasets written before per-column dtypes have one for all
+    if "dtypes" in meta:
+        return {c: np.dtype(meta["dtypes"][c]) for c in meta["columns"]}
+    return {c: np.dtype(meta["dtype"]) for c in meta["columns"]}
+
+
+def _read_partition(directory, part, rows, dtypes, wanted):
+    # byte offsets follow from the row count: timestamps first, then values
+    offsets, offset = {}, rows * TIME_DTYPE.itemsize
+    for col, dtype in dtypes.items():
+        offsets[col] = offset
+        offset += rows * dtype.itemsize
+
+    out = {}
+    with open(_partition_file(directory, part), "rb") as f:
+        out["timestamp"] = np.fromfile(f, dtype=TIME_DTYPE, count=rows)
+        for col in wanted:
+            f.seek(offsets[col])
+            out[col] = np.fromfile(f, dtype=dtypes[col], count=rows)
+    return out
+
+
+def _column_dtypes(df, columns):
+    return {c: np.dtype("<f4") if df[c].dtype == np.float32 else VALUE_DTYPE for c in columns}
+
+
+def _to_arrays(df, dtypes):
+    ts = pd.to_datetime(df["timestamp"]).to_numpy("datetime64[ns]")
+    arrays = {"timestamp": ts.astype(TIME_DTYPE)}
+    for col, dtype in dtypes.items():
+        arrays[col] = df[col].to_numpy(dtype)
+    return arrays
+
+
+def _partitions(arrays):
+    # "YYYY/MM" -> slice of the (time-sorted) arrays
+    months = arrays["timestamp"].astype("datetime64[ns]").astype("datetime64[M]")
+    bounds = np.flatnonzero(np.diff(months.astype("int64"))) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(months)]])
+    for lo, hi in zip(starts, ends):
+        month = str(months[lo])
+        yield f"{month[:4]}/{month[5:7]}", {k: v[lo:hi] for k, v in arrays.items()}
+
+
+def write_frame(dataset, df):
+    """Replace a dataset with the rows of df (a timestamp column plus values)."""
+    df = df.sort_values("timestamp")
+    columns = [c for c in df.columns if c != "timestamp"]
+    dtypes = _column_dtypes(df, columns)
+    arrays = _to_arrays(df, dtypes)
+
+    # build next to the old copy, then swap, so readers never see half a dataset
+    final = dataset_dir(dataset)
+    staging = f"{final}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    meta = {"columns": columns, "dtypes": {c: d.str for c, d in dtypes.items()}, "partitions": {}}
+    for part, chunk in _partitions(arrays):
+        meta["partitions"][part] = _write_partition(staging, part, chunk, columns)
+    _write_meta(staging, meta)
+
+    old = f"{final}.old-{os.getpid()}"
+    if os.path.exists(final):
+        os.replace(final, old)
+    os.replace(staging, final)
+    shutil.rmtree(old, ignore_errors=True)
+    return meta
+
+
+def append_frame(dataset, df):
+    """Add rows newer than the dataset's last timestamp.
+
+    Only the last existing partition and the new ones are rewritten.
+    Returns the number of rows added.
+    """
+    meta = read_meta(dataset)
+    last = last_timestamp(dataset)
+    df = df.sort_values("timestamp")
+    if last is not None:
+        df = df[pd.to_datetime(df["timestamp"]) > last]
+    if df.empty:
+        return 0
+
+    directory = dataset_dir(dataset)
+    columns = meta["columns"]
+    dtypes = _dtypes(meta)
+    for part, chunk in _partitions(_to_arrays(df, dtypes)):
+        if part in meta["partitions"]:
+            old = _read_partition(directory, part, meta["partitions"][part]["rows"], dtypes, columns)
+            chunk = {k: np.concatenate([old[k], v]) for k, v in chunk.items()}
+        meta["partitions"][part] = _write_partition(directory, part, chunk, columns)
+
+    _write_meta(directory, meta)
+    return len(df)
+
+
+def last_timestamp(dataset):
+    parts = read_meta(dataset)["partitions"]
+    if not parts:
+        return None
+    return pd.Timestamp(parts[max(parts)]["last"])
+
+
+def version(dataset):
+    """Content hash of the whole dataset, from the per-partition hashes."""
+    parts = read_meta(dataset)["partitions"]
+    h = hashlib.sha256()
+    for part in sorted(parts):
+        h.update(f"{part}:{parts[part]['sha256']}".encode())
+    return h.hexdigest()
+
+
+def read_frame(dataset, start=None, end=None, columns=None):
+    """Rows with start <= timestamp < end, only the requested value columns."""
+    meta = read_meta(dataset)
+    columns = meta["columns"] if columns is None else list(columns)
+    dtypes = _dtypes(meta)
+    lo = None if start is None else pd.Timestamp(start).value
+    hi = None if end is None else pd.Timestamp(end).value
+
+    directory = dataset_dir(dataset)
+    pieces = {c: [] for c in ["timestamp", *columns]}
+    for part in sorted(meta["partitions"]):
+        info = meta["partitions"][part]
+        if (lo is not None and info["last"] < lo) or (hi is not None and info["first"] >= hi):
+            continue
+        arrays = _read_partition(directory, part, info["rows"], dtypes, columns)
+        ts = arrays["timestamp"]
+        keep = slice(
+            None if lo is None else np.searchsorted(ts, lo, side="left"),
+            None if hi is None else np.searchsorted(ts, hi, side="left"),
+        )
+        for c, values in arrays.items():
+            pieces[c].append(values[keep])
+
+    data = {
+        c: np.concatenate(p) if p else np.empty(0, TIME_DTYPE if c == "timestamp" else dtypes[c])
+        for c, p in pieces.items()
+    }
+    data["timestamp"] = data["timestamp"].view("datetime64[ns]")
+    return pd.DataFrame(data)
+
+
+def read_tail(dataset, n_rows, columns=None):
+    """The last n_rows rows, opening partitions from the newest back."""
+    parts = read_meta(dataset)["partitions"]
+    total, start = 0, None
+    for part in sorted(parts, reverse=True):
+        start = parts[part]["first"]
+        total += parts[part]["rows"]
+        if total >= n_rows:
+            break
+    if start is None:
+        return read_frame(dataset, columns=columns)
+    return read_frame(dataset, start=pd.Timestamp(start), columns=columns).iloc[-n_rows:].reset_index(drop=True)
+
+
+def export_csv(dataset, path, float_format=None):
+    df = read_frame(dataset)
+    df.to_csv(path, index=False, float_format=float_format)
+    return len(df)
+
+
+# -------------------------------------------------
+# Merged region data, with the CSV as fallback
+# -------------------------------------------------
+def merged_dataset(region):
+    return f"merged/{region.lower()}"
+
+
+def load_merged(region, start=None, end=None, columns=None):
+    """A region's merged history from the store, or from its CSV if there is no store."""
+    dataset = merged_dataset(region)
+    if exists(dataset):
+        return read_frame(dataset, start=start, end=end, columns=columns)
+
+    usecols = None if columns is None else ["timestamp", *columns]
+    df = pd.read_csv(CONFIG[region]["data"], parse_dates=["timestamp"], usecols=usecols)
+    df = df.sort_values("timestamp")
+    if start is not None:
+        df = df[df["timestamp"] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df["timestamp"] < pd.Timestamp(end)]
+    return df.reset_index(drop=True)
+
+
+def load_merged_tail(region, n_rows=1):
+    """The last n_rows of a region's merged history without reading all of it."""
+    dataset = merged_dataset(region)
+    if exists(dataset):
+        return read_tail(dataset, n_rows)
+    return csv_append.read_tail(CONFIG[region]["data"], n_rows)
+
+
+def build(sources):
+    """{dataset: csv path} -> rewrite each dataset from its CSV."""
+    for dataset, path in sources.items():
+        df = pd.read_csv(path, parse_dates=["timestamp"])
+        meta = write_frame(dataset, df)
+        rows = sum(p["rows"] for p in meta["partitions"].values())
+        print(f"✅ {dataset}: {rows:,} rows in {len(meta['partitions'])} partitions ({dataset_dir(dataset)})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build store datasets from CSVs or export one back to CSV.")
+    parser.add_argument("sources", nargs="*", metavar="DATASET=CSV",
+                        help="datasets to build (default: merged data for every region)")
+    parser.add_argument("--export", nargs=2, metavar=("DATASET", "CSV"), help="write a dataset back out as CSV")
+    args = parser.parse_args()
+
+    if args.export:
+        dataset, path = args.export
+        print(f"✅ {export_csv(dataset, path):,} rows of {dataset} saved to {path}")
+    else:
+        sources = dict(item.split("=", 1) for item in args.sources) or {
+            merged_dataset(r): CONFIG[r]["data"] for r in REGIONS
+        }
+        build(sources)
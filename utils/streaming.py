@@ -0,0 +1,237 @@
+# utils/streaming.py
+
+# stateful forecasting for a feed of hourly observations. Each region keeps
+# ring buffers of its recent demand and temperature, and every lag and
+# rolling-window feature of the lag models (config.LAG_HOURS and
+# ROLLING_FEATURES) is updated in constant time per incoming hour: a lag is
+# an index into the ring, a rolling mean a running sum and a rolling max a
+# monotonic deque. preprocess.add_lag_features computes the same columns
+# over a whole history for training.
+#
+# a missing hour is pushed as a missing value, so windows that cover a gap
+# are NaN until it has scrolled out, exactly as in the batch features. Lag
+# models only answer once the row is complete (a week of hours after a cold
+# start or a long gap); prime() fills the buffers from the stored history.
+
+import math
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from utils.config import CONFIG, HORIZONS, LAG_HOURS, ROLLING_FEATURES, feature_columns
+from utils.metrics import timed_predict
+from utils.preprocess import NS_PER_HOUR, TIME_COLUMNS, time_features
+
+# the oldest value any feature reads, plus the current hour
+CAPACITY = max(LAG_HOURS + [window for _, _, window in ROLLING_FEATURES]) + 1
+
+
+class RingBuffer:
+    """The last `capacity` values pushed; lag(0) is the newest, NaN before any push."""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.values = [math.nan] * capacity
+        self.pos = capacity - 1
+
+    def push(self, value):
+        self.pos = (self.pos + 1) % self.capacity
+        self.values[self.pos] = value
+
+    def lag(self, k):
+        return self.values[(self.pos - k) % self.capacity]
+
+
+class RollingMean:
+    """Mean of the last `window` values of a RingBuffer, NaN while any is missing.
+
+    Call update() after every push. The running sum is recomputed from the
+    buffer once per window of pushes, so rounding never accumulates.
+    """
+
+    def __init__(self, buffer, window):
+        self.buffer = buffer
+        self.window = window
+        self.total = 0.0
+        # nothing pushed yet, the whole window is missing
+        self.missing = window
+        self.pushes = 0
+
+    def update(self):
+        entering, leaving = self.buffer.lag(0), self.buffer.lag(self.window)
+        if math.isnan(entering):
+            self.missing += 1
+        else:
+            self.total += entering
+        if math.isnan(leaving):
+            self.missing -= 1
+        else:
+            self.total -= leaving
+
+        self.pushes += 1
+        if self.pushes % self.window == 0:
+            self.total = math.fsum(v for v in map(self.buffer.lag, range(self.window)) if not math.isnan(v))
+
+    @property
+    def value(self):
+        return self.total / self.window if self.missing == 0 else math.nan
+
+
+class RollingMax:
+    """Max of the last `window` values of a RingBuffer, NaN while any is missing.
+
+    The deque holds (push number, value) with values decreasing from the
+    front, so the front is the max; each value is appended and popped once.
+    """
+
+    def __init__(self, buffer, window):
+        self.buffer = buffer
+        self.window = window
+        self.candidates = deque()
+        self.missing = window
+        self.pushes = 0
+
+    def update(self):
+        entering, leaving = self.buffer.lag(0), self.buffer.lag(self.window)
+        self.missing += math.isnan(entering) - math.isnan(leaving)
+
+        self.pushes += 1
+        if not math.isnan(entering):
+            while self.candidates and self.candidates[-1][1] <= entering:
+                self.candidates.pop()
+            self.candidates.append((self.pushes, entering))
+        while self.candidates and self.candidates[0][0] <= self.pushes - self.window:
+            self.candidates.popleft()
+
+    @property
+    def value(self):
+        return self.candidates[0][1] if self.missing == 0 else math.nan
+
+
+ROLLING = {"mean": RollingMean, "max": RollingMax}
+
+
+class FeatureStream:
+    """One region's feature row, kept current one observation at a time."""
+
+    def __init__(self, region):
+        self.region = region
+        self.columns = feature_columns(region, lags=True)
+        self.row = np.full(len(self.columns), np.nan)
+        self.reset()
+
+    def reset(self):
+        self.buffers = {"demand": RingBuffer(), "temp": RingBuffer()}
+        self.rolling = [
+            ROLLING[stat](self.buffers[source], window) for source, stat, window in ROLLING_FEATURES
+        ]
+        self.hour = None
+
+    def _push(self, demand_mw, temp_c):
+        self.buffers["demand"].push(demand_mw)
+        self.buffers["temp"].push(temp_c)
+        for stat in self.rolling:
+            stat.update()
+
+    def update(self, timestamp, demand_mw, temp_c):
+        """Add one hour; returns the feature row, or None for a repeated or earlier hour.
+
+        The row is reused by the next update, copy it to keep it.
+        """
+        ns = pd.Timestamp(timestamp).as_unit("ns").value
+        hour = ns // NS_PER_HOUR
+        if self.hour is not None and hour <= self.hour:
+            return None
+
+        if self.hour is not None and hour - self.hour > CAPACITY:
+            # every buffered value is out of reach, start over
+            self.reset()
+        elif self.hour is not None:
+            for _ in range(hour - self.hour - 1):
+                self._push(math.nan, math.nan)
+        self._push(float(demand_mw), float(temp_c))
+        self.hour = hour
+
+        row = self.row
+        row[0], row[1] = demand_mw, temp_c
+        end = 2 + len(TIME_COLUMNS)
+        time_features(np.array([ns], dtype="int64"), out=row[None, 2:end])
+        demand = self.buffers["demand"]
+        for i, lag in enumerate(LAG_HOURS, start=end):
+            row[i] = demand.lag(lag)
+        for i, stat in enumerate(self.rolling, start=end + len(LAG_HOURS)):
+            row[i] = stat.value
+        return row
+
+    @property
+    def ready(self):
+        return self.hour is not None and bool(np.isfinite(self.row).all())
+
+    def prime(self, df):
+        """Replay the tail of a history frame (timestamp, demand_mw, temp column)."""
+        temp_col = CONFIG[self.region]["temp_col"]
+        tail = df.iloc[-CAPACITY:]
+        for ts, demand, temp in zip(tail["timestamp"], tail["demand_mw"], tail[temp_col]):
+            self.update(ts, demand, temp)
+
+
+class StreamingForecaster:
+    """Every horizon's forecast from the lag models as each observation arrives.
+
+    registry must load the lag models (ModelRegistry(lags=True)). A region
+    served by a multi-horizon model answers all horizons with one predict.
+    """
+
+    def __init__(self, registry=None, horizons=HORIZONS):
+        if registry is None:
+            from utils.model_registry import ModelRegistry
+
+            registry = ModelRegistry(lags=True)
+        self.registry = registry
+        self.horizons = list(horizons)
+        self.streams = {}
+        self._lock = threading.Lock()
+        self._region_locks = {}
+
+    def stream(self, region):
+        with self._lock:
+            if region not in self.streams:
+                self.streams[region] = FeatureStream(region)
+                self._region_locks[region] = threading.Lock()
+            return self.streams[region], self._region_locks[region]
+
+    def prime(self, region, df=None):
+        """Fill a region's buffers from its stored history (or df)."""
+        if df is None:
+            from utils.store import load_merged
+
+            df = load_merged(region)
+        stream, lock = self.stream(region)
+        with lock:
+            stream.prime(df)
+        return stream.ready
+
+    def observe(self, region, timestamp, demand_mw, temp_c):
+        """{horizon: forecast MW}, None for every horizon until the features are complete.
+
+        Returns None for a repeated or out-of-order hour, which is ignored.
+        """
+        stream, lock = self.stream(region)
+        with lock:
+            row = stream.update(timestamp, demand_mw, temp_c)
+            if row is None:
+                return None
+            if not stream.ready:
+                return {h: None for h in self.horizons}
+            X = pd.DataFrame(row[None, :], columns=stream.columns)
+
+        multi = self.registry.horizon_model(region)
+        if multi is not None:
+            pred = np.asarray(timed_predict(multi, X, "stream"))[0]
+            return {h: float(pred[list(multi.horizons_).index(h)]) for h in self.horizons}
+        return {
+            h: float(timed_predict(self.registry.get(region, h), X, "stream")[0])
+            for h in self.horizons
+        }
@@ -0,0 +1,49 @@
+# utils/timing.py
+
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """Wall-clock breakdown of one script run, phase by phase.
+
+    mark() closes the phase that has been running since the previous mark,
+    phase() times a block. Both append to the same ordered list, so the
+    phases add up to the total.
+    """
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    @contextmanager
+    def phase(self, name):
+        # anything since the last mark that isn't part of this block
+        gap = time.perf_counter() - self._last
+        if gap > 0.001:
+            self.phases.append(("other", gap))
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, end - begin))
+            self._last = end
+
+    def total(self):
+        return time.perf_counter() - self.start
+
+    def report(self):
+        """Phases merged by name in first-seen order, in milliseconds."""
+        merged = {}
+        for name, seconds in self.phases:
+            merged[name] = merged.get(name, 0.0) + seconds * 1000
+        rows = [{"phase": name, "ms": round(ms, 1)} for name, ms in merged.items()]
+        rows.append({"phase": "total", "ms": round(self.total() * 1000, 1)})
+        return rows
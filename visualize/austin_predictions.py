@@ -3,6 +3,9 @@ import joblib
 import matplotlib.pyplot as plt
 import numpy as np
 
+from utils.config import feature_columns
+from utils.preprocess import add_time_features
+
 # CONFIG
 HORIZON_HOURS = 1   # change to 3, 6, or 24
 DATA_PATH = "data/merged/austin_scent_merged.csv"
@@ -12,23 +15,15 @@ MODEL_PATH = f"models/austin_model_{HORIZON_HOURS}h.pkl"
 df = pd.read_csv(DATA_PATH, parse_dates=["timestamp"])
 df = df.sort_values("timestamp")
 
-# time features
-df["hour"] = df["timestamp"].dt.hour
-df["dayofweek"] = df["timestamp"].dt.dayofweek
-df["is_weekend"] = df["dayofweek"].isin([5, 6]).astype(int)
+# time features, the same ones the models trained on
+df = add_time_features(df)
 
 # target (multi-hour ahead)
 df["target_demand"] = df["demand_mw"].shift(-HORIZON_HOURS)
 df = df.dropna()
 
 # features for prediction
-features = [
-    "demand_mw",
-    "austin_temp_c",
-    "hour",
-    "dayofweek",
-    "is_weekend"
-]
+features = feature_columns("Austin")
 
 X = df[features]
 y = df["target_demand"]